@@ -4,8 +4,23 @@
 -- Create the database user if it doesn't exist
 -- (This is handled by the POSTGRES_USER environment variable in docker-compose)
 
--- Enable required extensions
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Trigram matching for fuzzy title search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Time-ordered UUIDv7 generator for primary keys
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS uuid AS $$
+    -- 48-bit Unix epoch milliseconds followed by random bits (RFC 9562 UUIDv7)
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+        'hex')::uuid;
+$$ LANGUAGE sql VOLATILE;
 
 -- Create enum types for consistent values
 CREATE TYPE sync_status_enum AS ENUM (
@@ -26,7 +41,7 @@ CREATE TYPE esrb_rating_enum AS ENUM (
 
 -- Create the platforms table first so we can insert into it
 CREATE TABLE IF NOT EXISTS platforms (
-    platform_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    platform_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     platform_code VARCHAR(20) UNIQUE NOT NULL,
     platform_name VARCHAR(100) NOT NULL,
     api_available BOOLEAN DEFAULT false,
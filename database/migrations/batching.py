@@ -0,0 +1,78 @@
+"""Helpers for batched data migrations.
+
+Schema changes run in Alembic's single migration transaction, which is fine for
+DDL. Data migrations (backfills, re-normalization) over large tables should not:
+one huge transaction holds locks, bloats WAL and can exhaust memory. Use
+``backfill_in_batches`` from a revision's ``upgrade()`` instead:
+
+    from migrations.batching import backfill_in_batches
+
+    def upgrade() -> None:
+        games = sa.table('games', sa.column('game_id'), sa.column('esrb_rank'))
+
+        def apply(connection, ids):
+            connection.execute(
+                games.update().where(games.c.game_id.in_(ids)).values(esrb_rank=...)
+            )
+
+        backfill_in_batches(games.c.game_id, apply)
+
+Batches are read with keyset pagination on the primary key (UUIDv7 keys are
+time-ordered, so this walks the index sequentially) and each batch is committed
+on its own inside ``autocommit_block()``. Not usable in offline (--sql) mode.
+"""
+
+import logging
+from typing import Any, Callable, List, Optional
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def backfill_in_batches(
+    pk: sa.ColumnElement,
+    apply_batch: Callable[[Connection, List[Any]], None],
+    where: Optional[sa.ColumnElement] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Call ``apply_batch(connection, ids)`` for every batch of primary keys.
+
+    Args:
+        pk: Primary key column of the table being migrated
+        apply_batch: Callback that migrates the rows with the given keys
+        where: Optional filter restricting which rows are visited
+        batch_size: Rows per batch (keep between 20 and 1000)
+
+    Returns:
+        Number of rows visited
+    """
+    total = 0
+    last_id = None
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+
+        while True:
+            stmt = sa.select(pk).order_by(pk).limit(batch_size)
+            if where is not None:
+                stmt = stmt.where(where)
+            if last_id is not None:
+                stmt = stmt.where(pk > last_id)
+
+            ids = connection.execute(stmt).scalars().all()
+            if not ids:
+                break
+
+            apply_batch(connection, ids)
+
+            total += len(ids)
+            last_id = ids[-1]
+            logger.info(f"Migrated {total} rows")
+
+    return total
@@ -18,9 +18,30 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# Time-ordered UUIDv7 generator. Sequential keys append to the right-most B-tree
+# leaf instead of splitting random pages, which keeps PK indexes compact.
+UUID_GENERATE_V7 = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS uuid AS $$
+    -- 48-bit Unix epoch milliseconds followed by random bits (RFC 9562 UUIDv7)
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+        'hex')::uuid;
+$$ LANGUAGE sql VOLATILE;
+"""
+
+
 def upgrade() -> None:
-    # Enable UUID extension
-    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+    # UUIDv7 primary key generator (gen_random_uuid() is built in since PostgreSQL 13)
+    op.execute(UUID_GENERATE_V7)
+    # Trigram matching for fuzzy title search
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
     
     # Create enum types
     sync_status_enum = postgresql.ENUM(
@@ -47,11 +68,18 @@ def upgrade() -> None:
     )
     esrb_rating_enum.create(op.get_bind())
     
+    # Shared 0-100 score type, declared once instead of a CHECK per column
+    score_0_100 = postgresql.DOMAIN(
+        'score_0_100', sa.Integer(),
+        check='VALUE BETWEEN 0 AND 100'
+    )
+    score_0_100.create(op.get_bind())
+    
     # Create platforms table
     op.create_table(
         'platforms',
         sa.Column('platform_id', postgresql.UUID(as_uuid=True), 
-                 server_default=sa.text('uuid_generate_v4()'), nullable=False),
+                 server_default=sa.text('uuid_generate_v7()'), nullable=False),
         sa.Column('platform_code', sa.String(50), nullable=False),
         sa.Column('platform_name', sa.String(100), nullable=False),
         sa.Column('api_available', sa.Boolean(), server_default=sa.text('false')),
@@ -69,7 +97,7 @@ def upgrade() -> None:
     op.create_table(
         'user_libraries',
         sa.Column('library_id', postgresql.UUID(as_uuid=True), 
-                 server_default=sa.text('uuid_generate_v4()'), nullable=False),
+                 server_default=sa.text('uuid_generate_v7()'), nullable=False),
         sa.Column('platform_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('user_identifier', sa.String(255), nullable=False),
         sa.Column('display_name', sa.String(255), nullable=False),
@@ -85,17 +113,15 @@ def upgrade() -> None:
                  server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.ForeignKeyConstraint(['platform_id'], ['platforms.platform_id'], 
                                ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('library_id'),
-        sa.UniqueConstraint('platform_id', 'user_identifier')
+        sa.PrimaryKeyConstraint('library_id')
     )
     
     # Create games table
     op.create_table(
         'games',
         sa.Column('game_id', postgresql.UUID(as_uuid=True), 
-                 server_default=sa.text('uuid_generate_v4()'), nullable=False),
+                 server_default=sa.text('uuid_generate_v7()'), nullable=False),
         sa.Column('title', sa.String(500), nullable=False),
-        sa.Column('normalized_title', sa.String(500), nullable=False),
         sa.Column('slug', sa.String(500)),
         sa.Column('description', sa.Text()),
         sa.Column('short_description', sa.Text()),
@@ -108,9 +134,9 @@ def upgrade() -> None:
         sa.Column('esrb_rating', esrb_rating_enum),
         sa.Column('esrb_descriptors', postgresql.JSONB()),
         sa.Column('pegi_rating', sa.Integer()),
-        sa.Column('metacritic_score', sa.Integer()),
+        sa.Column('metacritic_score', score_0_100),
         sa.Column('metacritic_url', sa.String(500)),
-        sa.Column('steam_score', sa.Integer()),
+        sa.Column('steam_score', score_0_100),
         sa.Column('steam_review_count', sa.Integer()),
         sa.Column('cover_image_url', sa.String(500)),
         sa.Column('background_image_url', sa.String(500)),
@@ -124,13 +150,17 @@ def upgrade() -> None:
         sa.Column('psn_id', sa.String(100)),
         sa.Column('playtime_main_hours', sa.Integer()),
         sa.Column('playtime_completionist_hours', sa.Integer()),
-        sa.Column('search_vector', postgresql.TSVECTOR()),
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(developer, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(publisher, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True
+        )),
         sa.Column('created_at', sa.TIMESTAMP(timezone=True), 
                  server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.Column('updated_at', sa.TIMESTAMP(timezone=True), 
                  server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.CheckConstraint('metacritic_score BETWEEN 0 AND 100'),
-        sa.CheckConstraint('steam_score BETWEEN 0 AND 100'),
         sa.PrimaryKeyConstraint('game_id'),
         sa.UniqueConstraint('slug')
     )
@@ -139,21 +169,68 @@ def upgrade() -> None:
     # (This is a simplified version - the full migration would include all tables)
     
     # Create indexes
-    op.create_index('idx_games_normalized_title', 'games', ['normalized_title'])
-    op.create_index('idx_games_steam_appid', 'games', ['steam_appid'])
-    op.create_index('idx_games_xbox_id', 'games', ['xbox_id'])
-    op.create_index('idx_games_psn_id', 'games', ['psn_id'])
+    # Trigram GIN: serves title ILIKE '%...%' and similarity() without a normalized copy
+    op.execute("CREATE INDEX idx_games_title_trgm ON games USING gin (title gin_trgm_ops)")
     op.create_index('idx_games_search_vector', 'games', ['search_vector'], postgresql_using='gin')
     op.create_index('idx_games_esrb_rating', 'games', ['esrb_rating'])
     op.create_index('idx_games_metacritic_score', 'games', ['metacritic_score'])
-    op.create_index('idx_games_release_date', 'games', ['release_date'])
+    # Platform IDs are NULL for most rows; partial unique indexes stay small, dedupe imports
+    # and back ON CONFLICT (<col>) WHERE <col> IS NOT NULL upserts
+    for column in ('steam_appid', 'gog_id', 'epic_id', 'xbox_id', 'psn_id'):
+        op.execute(f"CREATE UNIQUE INDEX ux_games_{column} ON games ({column}) WHERE {column} IS NOT NULL")
+    # BRIN: release_date is append-mostly and correlated with import order
+    op.execute(
+        "CREATE INDEX idx_games_release_date_brin ON games USING brin (release_date) "
+        "WITH (pages_per_range = 32)"
+    )
+    
+    # JSONB containment (@>) indexes; jsonb_path_ops is smaller and faster than jsonb_ops
+    op.execute("CREATE INDEX idx_games_genres_gin ON games USING gin (genres jsonb_path_ops)")
+    op.execute("CREATE INDEX idx_games_tags_gin ON games USING gin (tags jsonb_path_ops)")
+    op.execute("CREATE INDEX idx_games_platforms_available_gin ON games USING gin (platforms_available jsonb_path_ops)")
+    op.execute("CREATE INDEX idx_games_esrb_descriptors_gin ON games USING gin (esrb_descriptors jsonb_path_ops)")
     
-    op.create_index('idx_user_libraries_platform', 'user_libraries', ['platform_id'])
-    op.create_index('idx_user_libraries_sync_status', 'user_libraries', ['sync_status'])
-    op.create_index('idx_user_libraries_last_sync', 'user_libraries', ['last_sync_at'])
+    # Uniqueness plus the columns library lookups read, so they are index-only scans
+    op.execute(
+        "CREATE UNIQUE INDEX ux_user_libraries_platform_user ON user_libraries (platform_id, user_identifier) "
+        "INCLUDE (library_id, display_name, sync_enabled, last_sync_at)"
+    )
+    
+    # Partial indexes for the sync worker: only sync-enabled libraries are ever scanned
+    op.execute(
+        "CREATE INDEX idx_user_libraries_pending ON user_libraries (last_sync_at) "
+        "WHERE sync_enabled = true AND sync_status IN ('pending', 'failed', 'rate_limited')"
+    )
+    op.execute(
+        "CREATE INDEX idx_user_libraries_sync_enabled ON user_libraries (platform_id) "
+        "INCLUDE (library_id, last_sync_at) WHERE sync_enabled"
+    )
+    
+    # lz4 TOAST compression (PG14+) for JSONB blobs read on every sync; decompresses much faster than pglz
+    for table, column in (
+        ('user_libraries', 'api_credentials'),
+        ('user_libraries', 'sync_position'),
+        ('games', 'screenshots'),
+        ('games', 'videos'),
+        ('games', 'tags'),
+    ):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION lz4")
 
 
 def downgrade() -> None:
+    # Drop raw-SQL indexes
+    op.execute("DROP INDEX IF EXISTS idx_user_libraries_sync_enabled")
+    op.execute("DROP INDEX IF EXISTS idx_user_libraries_pending")
+    op.execute("DROP INDEX IF EXISTS ux_user_libraries_platform_user")
+    op.execute("DROP INDEX IF EXISTS idx_games_esrb_descriptors_gin")
+    op.execute("DROP INDEX IF EXISTS idx_games_title_trgm")
+    for column in ('steam_appid', 'gog_id', 'epic_id', 'xbox_id', 'psn_id'):
+        op.execute(f"DROP INDEX IF EXISTS ux_games_{column}")
+    op.execute("DROP INDEX IF EXISTS idx_games_release_date_brin")
+    op.execute("DROP INDEX IF EXISTS idx_games_platforms_available_gin")
+    op.execute("DROP INDEX IF EXISTS idx_games_tags_gin")
+    op.execute("DROP INDEX IF EXISTS idx_games_genres_gin")
+    
     # Drop all tables and types in reverse order
     op.drop_table('user_libraries')
     op.drop_table('games') 
@@ -164,6 +241,8 @@ def downgrade() -> None:
     op.execute('DROP TYPE IF EXISTS game_status_enum') 
     op.execute('DROP TYPE IF EXISTS operation_status_enum')
     op.execute('DROP TYPE IF EXISTS esrb_rating_enum')
+    op.execute('DROP DOMAIN IF EXISTS score_0_100')
     
-    # Drop extension
-    op.execute('DROP EXTENSION IF EXISTS "uuid-ossp"')
\ No newline at end of file
+    # Drop UUIDv7 generator
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
+    op.execute('DROP EXTENSION IF EXISTS pg_trgm')
\ No newline at end of file
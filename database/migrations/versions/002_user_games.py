@@ -0,0 +1,71 @@
+"""Add user_games table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-08-05 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-library ownership, playtime and user data; mirrors database/schema.sql
+    op.create_table(
+        'user_games',
+        sa.Column('user_game_id', postgresql.UUID(as_uuid=True),
+                 server_default=sa.text('uuid_generate_v7()'), nullable=False),
+        sa.Column('library_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('game_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('platform_game_id', sa.String(255)),
+        sa.Column('owned', sa.Boolean(), server_default=sa.text('true')),
+        sa.Column('owned_date', sa.TIMESTAMP(timezone=True)),
+        sa.Column('total_playtime_minutes', sa.Integer(), server_default=sa.text('0')),
+        sa.Column('last_played_at', sa.TIMESTAMP(timezone=True)),
+        sa.Column('first_played_at', sa.TIMESTAMP(timezone=True)),
+        sa.Column('game_status', sa.String(50), server_default=sa.text("'unplayed'")),
+        sa.Column('user_rating', sa.Integer()),
+        sa.Column('user_notes', sa.Text()),
+        sa.Column('is_favorite', sa.Boolean(), server_default=sa.text('false')),
+        sa.Column('platform_data', postgresql.JSONB()),
+        sa.Column('last_synced_at', sa.TIMESTAMP(timezone=True),
+                 server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True),
+                 server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True),
+                 server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.CheckConstraint('user_rating BETWEEN 1 AND 5'),
+        sa.ForeignKeyConstraint(['library_id'], ['user_libraries.library_id'],
+                               ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['game_id'], ['games.game_id'],
+                               ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_game_id'),
+        sa.UniqueConstraint('library_id', 'game_id')
+    )
+
+    op.create_index('idx_user_games_library_id', 'user_games', ['library_id'])
+    op.create_index('idx_user_games_status', 'user_games', ['game_status'])
+    op.create_index(
+        'idx_user_games_last_played', 'user_games', ['last_played_at'],
+        postgresql_where=sa.text('last_played_at IS NOT NULL')
+    )
+    op.create_index('idx_user_games_playtime', 'user_games', ['total_playtime_minutes'])
+    op.create_index(
+        'idx_user_games_favorites', 'user_games', ['is_favorite'],
+        postgresql_where=sa.text('is_favorite = true')
+    )
+
+
+def downgrade() -> None:
+    # Dropping the table drops its indexes
+    op.drop_table('user_games')
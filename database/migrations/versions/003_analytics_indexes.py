@@ -0,0 +1,36 @@
+"""Add user_games indexes for analytics filters
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-08-12 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # analyze_gaming_patterns: library_id equality plus a last_played_at range
+    op.create_index(
+        'idx_user_games_library_last_played', 'user_games',
+        ['library_id', sa.text('last_played_at DESC')]
+    )
+    # "new games started" counts filter on first_played_at
+    op.create_index(
+        'idx_user_games_first_played', 'user_games', ['first_played_at'],
+        postgresql_where=sa.text('first_played_at IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_games_first_played', table_name='user_games')
+    op.drop_index('idx_user_games_library_last_played', table_name='user_games')
@@ -0,0 +1,38 @@
+"""Add generated esrb_rank column to games
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-08-12 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ESRB ratings are totally ordered; RP (rating pending) ranks 0 so it never passes a max-rating filter
+ESRB_RANK = (
+    "CASE esrb_rating WHEN 'E' THEN 1 WHEN 'E10+' THEN 2 WHEN 'T' THEN 3 "
+    "WHEN 'M' THEN 4 WHEN 'AO' THEN 5 WHEN 'RP' THEN 0 END"
+)
+
+
+def upgrade() -> None:
+    # Content filters become one range predicate (esrb_rank BETWEEN 1 AND :max) instead of an IN list
+    op.add_column(
+        'games',
+        sa.Column('esrb_rank', sa.SmallInteger(), sa.Computed(ESRB_RANK, persisted=True))
+    )
+    op.create_index('idx_games_esrb_rank', 'games', ['esrb_rank'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_games_esrb_rank', table_name='games')
+    op.drop_column('games', 'esrb_rank')
@@ -0,0 +1,31 @@
+"""Add trigram indexes for developer/publisher substring search
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-08-14 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# title already has idx_games_title_trgm (001); description is left to full-text search
+TRIGRAM_COLUMNS = ("developer", "publisher")
+
+
+def upgrade() -> None:
+    # search_games matches ILIKE '%query%', which b-tree indexes cannot serve
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"CREATE INDEX idx_games_{column}_trgm ON games USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS idx_games_{column}_trgm")
@@ -0,0 +1,26 @@
+"""Add (title, game_id) index for keyset pagination of game search
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-08-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # search_games pages with WHERE (title, game_id) > (:title, :game_id) ORDER BY title, game_id
+    op.create_index('idx_games_title_game_id', 'games', ['title', 'game_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_games_title_game_id', table_name='games')
@@ -1,12 +1,30 @@
 -- Game Djinn Database Schema
 -- PostgreSQL with JSONB for flexible platform data
 
--- Enable UUID extension
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Trigram matching for fuzzy title search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Time-ordered UUIDv7 generator for primary keys
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS uuid AS $$
+    -- 48-bit Unix epoch milliseconds followed by random bits (RFC 9562 UUIDv7)
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+        'hex')::uuid;
+$$ LANGUAGE sql VOLATILE;
+
+-- Review scores (Metacritic, Steam positive percentage)
+CREATE DOMAIN score_0_100 AS INTEGER CHECK (VALUE BETWEEN 0 AND 100);
 
 -- Platform registry table
 CREATE TABLE platforms (
-    platform_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    platform_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     platform_code VARCHAR(50) UNIQUE NOT NULL, -- steam, xbox, gog, manual, etc.
     platform_name VARCHAR(100) NOT NULL,
     api_available BOOLEAN DEFAULT false,
@@ -18,27 +36,24 @@ CREATE TABLE platforms (
 
 -- User libraries across platforms
 CREATE TABLE user_libraries (
-    library_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    library_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     platform_id UUID NOT NULL REFERENCES platforms(platform_id) ON DELETE CASCADE,
     user_identifier VARCHAR(255) NOT NULL, -- Platform-specific user ID
     display_name VARCHAR(255) NOT NULL,
-    api_credentials JSONB, -- Encrypted platform credentials/tokens
+    api_credentials JSONB COMPRESSION lz4, -- Encrypted platform credentials/tokens
     sync_enabled BOOLEAN DEFAULT true,
     last_sync_at TIMESTAMP WITH TIME ZONE,
     sync_status VARCHAR(50) DEFAULT 'pending', -- pending, in_progress, completed, failed, rate_limited
     sync_error TEXT,
-    sync_position JSONB, -- For resumable sync operations
+    sync_position JSONB COMPRESSION lz4, -- For resumable sync operations
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    
-    UNIQUE(platform_id, user_identifier)
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Universal games catalog with rich metadata
 CREATE TABLE games (
-    game_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    game_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     title VARCHAR(500) NOT NULL,
-    normalized_title VARCHAR(500) NOT NULL, -- For matching across platforms
     slug VARCHAR(500) UNIQUE, -- URL-friendly identifier
     
     -- Rich metadata
@@ -48,25 +63,29 @@ CREATE TABLE games (
     developer VARCHAR(255),
     publisher VARCHAR(255),
     genres JSONB, -- Array of genre strings
-    tags JSONB, -- Array of tag strings
+    tags JSONB COMPRESSION lz4, -- Array of tag strings
     platforms_available JSONB, -- Array of platform codes where game is available
     
     -- Content ratings
     esrb_rating VARCHAR(20), -- E, E10+, T, M, AO, RP
     esrb_descriptors JSONB, -- Array of content descriptors
+    esrb_rank SMALLINT GENERATED ALWAYS AS (
+        CASE esrb_rating WHEN 'E' THEN 1 WHEN 'E10+' THEN 2 WHEN 'T' THEN 3
+                         WHEN 'M' THEN 4 WHEN 'AO' THEN 5 WHEN 'RP' THEN 0 END
+    ) STORED, -- ESRB order for range filters (RP = 0)
     pegi_rating INTEGER, -- 3, 7, 12, 16, 18
     
     -- Review scores
-    metacritic_score INTEGER CHECK (metacritic_score BETWEEN 0 AND 100),
+    metacritic_score score_0_100,
     metacritic_url VARCHAR(500),
-    steam_score INTEGER CHECK (steam_score BETWEEN 0 AND 100), -- Steam positive percentage
+    steam_score score_0_100, -- Steam positive percentage
     steam_review_count INTEGER,
     
     -- Media
     cover_image_url VARCHAR(500),
     background_image_url VARCHAR(500),
-    screenshots JSONB, -- Array of screenshot URLs
-    videos JSONB, -- Array of video objects
+    screenshots JSONB COMPRESSION lz4, -- Array of screenshot URLs
+    videos JSONB COMPRESSION lz4, -- Array of video objects
     
     -- Game details
     website_url VARCHAR(500),
@@ -80,8 +99,13 @@ CREATE TABLE games (
     playtime_main_hours INTEGER,
     playtime_completionist_hours INTEGER,
     
-    -- Search optimization
-    search_vector tsvector,
+    -- Search optimization (generated column, kept in sync by PostgreSQL)
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(developer, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(publisher, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+    ) STORED,
     
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
@@ -89,7 +113,7 @@ CREATE TABLE games (
 
 -- User-specific game data
 CREATE TABLE user_games (
-    user_game_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_game_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     library_id UUID NOT NULL REFERENCES user_libraries(library_id) ON DELETE CASCADE,
     game_id UUID NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
     
@@ -125,7 +149,7 @@ CREATE TABLE user_games (
 
 -- Cross-platform achievements/trophies
 CREATE TABLE game_achievements (
-    achievement_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    achievement_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     game_id UUID NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
     platform_id UUID NOT NULL REFERENCES platforms(platform_id) ON DELETE CASCADE,
     
@@ -145,7 +169,7 @@ CREATE TABLE game_achievements (
 
 -- User achievement unlocks
 CREATE TABLE user_achievements (
-    user_achievement_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_achievement_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user_game_id UUID NOT NULL REFERENCES user_games(user_game_id) ON DELETE CASCADE,
     achievement_id UUID NOT NULL REFERENCES game_achievements(achievement_id) ON DELETE CASCADE,
     
@@ -159,7 +183,7 @@ CREATE TABLE user_achievements (
 
 -- Smart collections for organizing games
 CREATE TABLE game_collections (
-    collection_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    collection_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     library_id UUID NOT NULL REFERENCES user_libraries(library_id) ON DELETE CASCADE,
     
     name VARCHAR(255) NOT NULL,
@@ -188,7 +212,7 @@ CREATE TABLE collection_games (
 
 -- Game matching for cross-platform detection
 CREATE TABLE game_matches (
-    match_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    match_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     primary_game_id UUID NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
     matched_game_id UUID NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
     
@@ -203,7 +227,7 @@ CREATE TABLE game_matches (
 
 -- Sync operations log for tracking and debugging
 CREATE TABLE sync_operations (
-    operation_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    operation_id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     library_id UUID NOT NULL REFERENCES user_libraries(library_id) ON DELETE CASCADE,
     
     operation_type VARCHAR(50) NOT NULL, -- full_sync, incremental_sync, manual_sync
@@ -224,41 +248,39 @@ CREATE TABLE sync_operations (
 );
 
 -- Create indexes for performance
-CREATE INDEX idx_games_normalized_title ON games(normalized_title);
-CREATE INDEX idx_games_steam_appid ON games(steam_appid) WHERE steam_appid IS NOT NULL;
-CREATE INDEX idx_games_xbox_id ON games(xbox_id) WHERE xbox_id IS NOT NULL;
-CREATE INDEX idx_games_psn_id ON games(psn_id) WHERE psn_id IS NOT NULL;
+CREATE INDEX idx_games_title_trgm ON games USING gin(title gin_trgm_ops);
+CREATE INDEX idx_games_developer_trgm ON games USING gin(developer gin_trgm_ops);
+CREATE INDEX idx_games_publisher_trgm ON games USING gin(publisher gin_trgm_ops);
+CREATE INDEX idx_games_title_game_id ON games(title, game_id);
+CREATE UNIQUE INDEX ux_games_steam_appid ON games(steam_appid) WHERE steam_appid IS NOT NULL;
+CREATE UNIQUE INDEX ux_games_gog_id ON games(gog_id) WHERE gog_id IS NOT NULL;
+CREATE UNIQUE INDEX ux_games_epic_id ON games(epic_id) WHERE epic_id IS NOT NULL;
+CREATE UNIQUE INDEX ux_games_xbox_id ON games(xbox_id) WHERE xbox_id IS NOT NULL;
+CREATE UNIQUE INDEX ux_games_psn_id ON games(psn_id) WHERE psn_id IS NOT NULL;
 CREATE INDEX idx_games_search_vector ON games USING gin(search_vector);
 CREATE INDEX idx_games_esrb_rating ON games(esrb_rating);
+CREATE INDEX idx_games_esrb_rank ON games(esrb_rank);
 CREATE INDEX idx_games_metacritic_score ON games(metacritic_score) WHERE metacritic_score IS NOT NULL;
-CREATE INDEX idx_games_release_date ON games(release_date) WHERE release_date IS NOT NULL;
+CREATE INDEX idx_games_release_date_brin ON games USING brin(release_date) WITH (pages_per_range = 32);
+CREATE INDEX idx_games_genres_gin ON games USING gin(genres jsonb_path_ops);
+CREATE INDEX idx_games_tags_gin ON games USING gin(tags jsonb_path_ops);
+CREATE INDEX idx_games_platforms_available_gin ON games USING gin(platforms_available jsonb_path_ops);
+CREATE INDEX idx_games_esrb_descriptors_gin ON games USING gin(esrb_descriptors jsonb_path_ops);
 
 CREATE INDEX idx_user_games_library_id ON user_games(library_id);
 CREATE INDEX idx_user_games_status ON user_games(game_status);
 CREATE INDEX idx_user_games_last_played ON user_games(last_played_at) WHERE last_played_at IS NOT NULL;
+CREATE INDEX idx_user_games_library_last_played ON user_games(library_id, last_played_at DESC);
+CREATE INDEX idx_user_games_first_played ON user_games(first_played_at) WHERE first_played_at IS NOT NULL;
 CREATE INDEX idx_user_games_playtime ON user_games(total_playtime_minutes);
 CREATE INDEX idx_user_games_favorites ON user_games(is_favorite) WHERE is_favorite = true;
 
-CREATE INDEX idx_user_libraries_platform ON user_libraries(platform_id);
-CREATE INDEX idx_user_libraries_sync_status ON user_libraries(sync_status);
-CREATE INDEX idx_user_libraries_last_sync ON user_libraries(last_sync_at);
-
--- Full-text search trigger for games
-CREATE OR REPLACE FUNCTION update_games_search_vector()
-RETURNS TRIGGER AS $$
-BEGIN
-    NEW.search_vector := 
-        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A') ||
-        setweight(to_tsvector('english', COALESCE(NEW.developer, '')), 'B') ||
-        setweight(to_tsvector('english', COALESCE(NEW.publisher, '')), 'B') ||
-        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER trigger_update_games_search_vector
-    BEFORE INSERT OR UPDATE ON games
-    FOR EACH ROW EXECUTE FUNCTION update_games_search_vector();
+CREATE UNIQUE INDEX ux_user_libraries_platform_user ON user_libraries(platform_id, user_identifier)
+    INCLUDE (library_id, display_name, sync_enabled, last_sync_at);
+CREATE INDEX idx_user_libraries_pending ON user_libraries(last_sync_at)
+    WHERE sync_enabled = true AND sync_status IN ('pending', 'failed', 'rate_limited');
+CREATE INDEX idx_user_libraries_sync_enabled ON user_libraries(platform_id)
+    INCLUDE (library_id, last_sync_at) WHERE sync_enabled;
 
 -- Updated timestamp triggers
 CREATE OR REPLACE FUNCTION update_updated_at_column()
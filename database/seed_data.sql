@@ -14,7 +14,7 @@ ON CONFLICT (platform_code) DO NOTHING;
 
 -- Insert sample games for testing
 INSERT INTO games (
-    title, normalized_title, slug, description, short_description,
+    title, slug, description, short_description,
     release_date, developer, publisher, genres, tags, platforms_available,
     esrb_rating, esrb_descriptors, metacritic_score, steam_score,
     cover_image_url, website_url, steam_appid,
@@ -22,7 +22,6 @@ INSERT INTO games (
 ) VALUES 
 (
     'The Witcher 3: Wild Hunt',
-    'the witcher 3 wild hunt',
     'the-witcher-3-wild-hunt',
     'As war rages on throughout the Northern Realms, you take on the greatest contract of your life — tracking down the Child of Prophecy, a living weapon that can alter the shape of the world.',
     'An open-world RPG masterpiece with rich storytelling and immersive gameplay.',
@@ -44,7 +43,6 @@ INSERT INTO games (
 ),
 (
     'Cyberpunk 2077',
-    'cyberpunk 2077',
     'cyberpunk-2077',
     'Cyberpunk 2077 is an open-world, action-adventure story set in Night City, a megalopolis obsessed with power, glamour and body modification.',
     'An open-world action-adventure set in the dystopian Night City.',
@@ -67,7 +65,6 @@ INSERT INTO games (
 (
     'Hades',
     'hades',
-    'hades',
     'Defy the god of the dead as you hack and slash out of the Underworld in this rogue-like dungeon crawler.',
     'A rogue-like dungeon crawler with stunning art and tight gameplay.',
     '2020-09-17',
@@ -88,7 +85,6 @@ INSERT INTO games (
 ),
 (
     'Among Us',
-    'among us',
     'among-us',
     'An online and local party game of teamwork and betrayal for 4-15 players...in space!',
     'A social deduction party game of teamwork and betrayal.',
@@ -111,7 +107,6 @@ INSERT INTO games (
 (
     'Minecraft',
     'minecraft',
-    'minecraft',
     'Minecraft is a game about placing blocks and going on adventures. Explore randomly generated worlds and build amazing things.',
     'A sandbox game where you can build anything you can imagine.',
     '2011-11-18',
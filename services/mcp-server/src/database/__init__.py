@@ -1,5 +1,5 @@
 """Database utilities for MCP server."""
 
-from .connection import get_session, close_engine, init_database
+from .connection import get_session, use_session, close_engine, init_database
 
-__all__ = ["get_session", "close_engine", "init_database"]
\ No newline at end of file
+__all__ = ["get_session", "use_session", "close_engine", "init_database"]
\ No newline at end of file
@@ -2,12 +2,23 @@
 
 import os
 import logging
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import QueuePool
+import functools
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 logger = logging.getLogger(__name__)
 
+# Connectivity probe, built once and reused
+_PING = text("SELECT 1")
+
+# Session supplied by the caller (e.g. a test fixture); get_session yields it
+# instead of opening one. Context-local, so concurrent tasks never share it.
+_session_override: ContextVar[Optional[AsyncSession]] = ContextVar("session_override", default=None)
+
 
 def get_database_url() -> str:
     """Get database URL from environment variable."""
@@ -24,36 +35,75 @@ def get_database_url() -> str:
     return db_url
 
 
-# Create async engine
-engine = create_async_engine(
-    get_database_url(),
-    poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=os.getenv("SQL_ECHO", "false").lower() == "true",
-    connect_args={
-        "server_settings": {
-            "application_name": "game_djinn_mcp",
+@functools.cache
+def _get_engine() -> AsyncEngine:
+    """Create the shared async engine on first use."""
+    return create_async_engine(
+        get_database_url(),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=20,
+        max_overflow=40,
+        pool_use_lifo=True,  # Reuse the most recently returned (warm) connection
+        # No per-checkout ping round trip; connections are recycled well before
+        # idle timeouts and a disconnect error invalidates the pool instead
+        pool_pre_ping=False,
+        pool_recycle=1800,
+        echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+        connect_args={
+            "server_settings": {
+                "application_name": "game_djinn_mcp",
+                "jit": "off",  # Short tool queries lose more to JIT startup than they gain
+            },
+            "command_timeout": 60,
+            "prepared_statement_cache_size": 500,  # Cache prepared tool queries per connection
         },
-        "command_timeout": 60,
-    },
-)
-
-# Session factory
-async_session = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=True,
-    autocommit=False,
-)
-
-
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session."""
-    async with async_session() as session:
+    )
+
+
+@functools.cache
+def _get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Create the session factory on first use."""
+    return async_sessionmaker(
+        _get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=True,
+        autocommit=False,
+    )
+
+
+def _reset_after_fork() -> None:
+    """Forget the parent's engine in a forked child; it is rebuilt on first use."""
+    if _get_engine.cache_info().currsize:
+        # close=False: leave the parent's sockets alone, just drop the pool
+        _get_engine().sync_engine.dispose(close=False)
+    _get_sessionmaker.cache_clear()
+    _get_engine.cache_clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@contextmanager
+def use_session(session: AsyncSession) -> Iterator[AsyncSession]:
+    """Route get_session() to an existing session for the current context."""
+    token = _session_override.set(session)
+    try:
+        yield session
+    finally:
+        _session_override.reset(token)
+
+
+@asynccontextmanager
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Get database session; commits on exit, rolls back on error."""
+    override = _session_override.get()
+    if override is not None:
+        # The owner of an injected session controls its transaction and lifetime
+        yield override
+        return
+    
+    async with _get_sessionmaker()() as session:
         try:
             yield session
             await session.commit()
@@ -66,17 +116,21 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 
 async def close_engine():
     """Close the database engine."""
-    await engine.dispose()
+    if not _get_engine.cache_info().currsize:
+        return
+    await _get_engine().dispose()
+    _get_sessionmaker.cache_clear()
+    _get_engine.cache_clear()
     logger.info("Database engine closed")
 
 
 async def init_database():
     """Initialize database connection and test connectivity."""
     try:
-        async with async_session() as session:
-            await session.execute("SELECT 1")
+        async with _get_sessionmaker()() as session:
+            await session.execute(_PING)
         logger.info("Database connection verified")
         return True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -1,8 +1,8 @@
 """MCP tools for Game Djinn."""
 
 from .platforms import get_supported_platforms, add_platform_library
-from .sync import sync_platform_library
-from .games import search_games, get_game_details
+from .sync import sync_platform_library, sync_platform_libraries
+from .games import search_games, get_game_details, get_games_by_ids
 from .analytics import analyze_gaming_patterns
 from .content import filter_by_content_rating
 from .recommendations import recommend_games
@@ -11,8 +11,10 @@ __all__ = [
     "get_supported_platforms",
     "add_platform_library", 
     "sync_platform_library",
+    "sync_platform_libraries",
     "search_games",
     "get_game_details",
+    "get_games_by_ids",
     "analyze_gaming_patterns",
     "filter_by_content_rating",
     "recommend_games",
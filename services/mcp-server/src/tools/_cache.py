@@ -0,0 +1,41 @@
+"""Small in-process TTL cache for MCP tool results."""
+
+import copy
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire ``ttl`` seconds after they are stored.
+    
+    Values are deep-copied in and out, so callers may mutate what they store or
+    get back without changing the cached entry seen by everyone else.
+    """
+    
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return copy.deepcopy(value)
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the oldest entry when full."""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
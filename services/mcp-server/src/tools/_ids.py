@@ -0,0 +1,17 @@
+"""Identifier helpers shared by the MCP tools."""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+
+# Type for binding a list of UUIDs as one uuid[] parameter (e.g. `col = ANY(:ids)`)
+UUID_ARRAY = ARRAY(PG_UUID(as_uuid=True))
+
+
+def parse_uuid(value: str) -> Optional[UUID]:
+    """Parse a UUID argument, returning None if it is malformed."""
+    try:
+        return UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,36 @@
+"""JSONB array predicates shared by the MCP tools."""
+
+from typing import List, Union
+
+from sqlalchemy import BindParameter, ColumnElement, any_, bindparam, literal
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+# jsonb[] of one-element arrays; dimensions=1 keeps the inner lists as JSON values
+_JSONB_ARRAY = ARRAY(JSONB, dimensions=1)
+
+
+def jsonb_array_value(values: List[str]) -> List[List[str]]:
+    """Convert values to the bound form expected by a contains_any parameter."""
+    return [[value] for value in values]
+
+
+def jsonb_array_param(key: str) -> BindParameter:
+    """Named contains_any parameter for reusable statements; bind with jsonb_array_value()."""
+    return bindparam(key, type_=_JSONB_ARRAY)
+
+
+def contains_any(
+    column: ColumnElement,
+    values: Union[List[str], BindParameter]
+) -> ColumnElement[bool]:
+    """
+    Match rows whose JSONB array column contains any of the given values.
+    
+    Renders as ``column @> ANY($1::jsonb[])``: a single bound array that the
+    jsonb_path_ops GIN indexes serve in one bitmap scan, instead of an OR of
+    one ``@>`` (or ``?``, which jsonb_path_ops cannot serve) per value.
+    ``values`` may also be a parameter from jsonb_array_param().
+    """
+    if not isinstance(values, BindParameter):
+        values = literal(jsonb_array_value(values), _JSONB_ARRAY)
+    return column.op("@>")(any_(values))
@@ -0,0 +1,57 @@
+"""Result shapes returned by the analytics and content MCP tools."""
+
+from typing import Any, Dict, List, NotRequired, Optional, Tuple, TypedDict
+
+
+class GenrePlaytime(TypedDict):
+    genre: str
+    playtime_hours: float
+
+
+class TrendPatterns(TypedDict):
+    trending_up: List[str]
+    trending_down: List[str]
+
+
+class AnalyticsResult(TypedDict):
+    """Payload of ``analyze_gaming_patterns``; breakdowns are omitted for empty periods."""
+    period: str
+    total_playtime_hours: float
+    games_played: int
+    new_games_started: int
+    games_completed: int
+    completion_rate_percent: float
+    most_played_genre: Optional[str]
+    patterns: TrendPatterns
+    avg_session_duration_minutes: NotRequired[float]
+    games_by_status: NotRequired[Dict[str, int]]
+    top_genres: NotRequired[List[GenrePlaytime]]
+    platform_distribution: NotRequired[Dict[str, float]]
+    insights: NotRequired[List[str]]
+    recommendations: NotRequired[List[Dict[str, Any]]]
+    predictions: NotRequired[List[Dict[str, Any]]]
+
+
+class FilterCriteria(TypedDict):
+    max_rating: str
+    excluded_descriptors: List[str]
+    include_unrated: bool
+    total_games_filtered: int
+    games_passed_filter: int
+    limit: int
+    offset: int
+
+
+class RatingInfo(TypedDict):
+    applied_rating: str
+    description: str
+    allowed_ratings: Tuple[str, ...]
+
+
+class ContentFilterResult(TypedDict):
+    """Payload of ``filter_by_content_rating``."""
+    filtered_games: List[Dict[str, Any]]
+    filter_criteria: FilterCriteria
+    content_warnings: List[str]
+    rating_info: RatingInfo
+    summary: str
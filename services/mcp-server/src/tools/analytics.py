@@ -1,16 +1,33 @@
 """Gaming analytics MCP tools."""
 
+import heapq
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy import select, func, and_, or_
+from operator import attrgetter
+from sqlalchemy import select, func, or_, literal, true, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import UserGame, UserLibrary, Game, Platform
 from database import get_session
+from ._ids import parse_uuid
+from ._schemas import AnalyticsResult, GenrePlaytime, TrendPatterns
 
 logger = logging.getLogger(__name__)
 
+# Insight text by playtime band, highest threshold (hours) first
+_PLAYTIME_INSIGHTS = (
+    (50, "You're an active gamer with {hours:.1f} hours of playtime"),
+    (20, "You have moderate gaming activity with {hours:.1f} hours"),
+    (float("-inf"), "You have light gaming activity - consider exploring new games"),
+)
+
+# Insight text keyed by "completes more than half of the games played"
+_COMPLETION_INSIGHTS = {
+    True: "You're great at finishing games you start",
+    False: "You might enjoy shorter games or focus on fewer titles",
+}
+
 
 async def analyze_gaming_patterns(
     library_id: Optional[str] = None,
@@ -43,21 +60,32 @@ async def analyze_gaming_patterns(
         if days_back:
             start_date = datetime.utcnow() - timedelta(days=days_back)
         
-        async for session in get_session():
-            # Build base query
-            query_base = select(UserGame, Game, UserLibrary, Platform).join(
-                Game, UserGame.game_id == Game.game_id
-            ).join(
-                UserLibrary, UserGame.library_id == UserLibrary.library_id
-            ).join(
-                Platform, UserLibrary.platform_id == Platform.platform_id
-            )
+        library_uuid = None
+        if library_id:
+            library_uuid = parse_uuid(library_id)
+            if library_uuid is None:
+                return {
+                    "error": f"Invalid library ID '{library_id}'",
+                    "period": time_period,
+                    "library_id": library_id
+                }
+        
+        async with get_session() as session:
+            # One index probe instead of running every aggregate for an unknown library
+            if library_uuid and not await session.scalar(
+                select(exists().where(UserLibrary.library_id == library_uuid))
+            ):
+                return {
+                    "error": f"Library with ID '{library_id}' not found",
+                    "period": time_period,
+                    "library_id": library_id
+                }
             
             conditions = []
             
             # Filter by library if specified
-            if library_id:
-                conditions.append(UserGame.library_id == library_id)
+            if library_uuid:
+                conditions.append(UserGame.library_id == library_uuid)
             
             # Filter by time period for last played
             if start_date:
@@ -68,17 +96,68 @@ async def analyze_gaming_patterns(
                     )
                 )
             
-            if conditions:
-                query_base = query_base.where(and_(*conditions))
+            # Aggregate server-side so only one row per group comes back
+            totals_query = select(
+                func.count().label("game_count"),
+                func.coalesce(func.sum(UserGame.total_playtime_minutes), 0).label("playtime_minutes"),
+                func.count().filter(UserGame.total_playtime_minutes > 0).label("games_played"),
+                func.count().filter(UserGame.game_status == "completed").label("games_completed"),
+                (
+                    func.count().filter(UserGame.first_played_at >= start_date)
+                    if start_date else literal(0)
+                ).label("new_games_started"),
+                func.avg(UserGame.user_rating).label("avg_rating"),
+            ).where(*conditions)
+            totals = (await session.execute(totals_query)).one()
+            
+            if not totals.game_count:
+                analytics = _empty_analytics(time_period)
+                if include_predictions:
+                    analytics["predictions"] = []
+                return analytics
+            
+            genre = func.jsonb_array_elements_text(Game.genres).table_valued("value").lateral("genre")
+            genre_query = select(
+                genre.c.value.label("genre"),
+                func.coalesce(func.sum(UserGame.total_playtime_minutes), 0).label("playtime_minutes"),
+                func.count().label("game_count"),
+                (
+                    func.count().filter(UserGame.last_played_at >= start_date)
+                    if start_date else literal(0)
+                ).label("recent_count"),
+            ).select_from(UserGame).join(
+                Game, UserGame.game_id == Game.game_id
+            ).join(
+                genre, true()
+            ).where(*conditions).group_by(
+                genre.c.value
+            ).order_by(
+                func.sum(UserGame.total_playtime_minutes).desc().nulls_last()
+            )
+            genre_rows = (await session.execute(genre_query)).all()
             
-            result = await session.execute(query_base)
-            user_games = result.all()
+            status_query = select(
+                UserGame.game_status, func.count()
+            ).where(*conditions).group_by(UserGame.game_status)
+            status_counts = dict((await session.execute(status_query)).all())
+            
+            platform_query = select(
+                Platform.platform_code,
+                func.coalesce(func.sum(UserGame.total_playtime_minutes), 0)
+            ).select_from(UserGame).join(
+                UserLibrary, UserGame.library_id == UserLibrary.library_id
+            ).join(
+                Platform, UserLibrary.platform_id == Platform.platform_id
+            ).where(*conditions).group_by(Platform.platform_code)
+            platform_minutes = dict((await session.execute(platform_query)).all())
             
             # Calculate analytics
-            analytics = _calculate_gaming_analytics(user_games, time_period, start_date)
+            analytics = _calculate_gaming_analytics(
+                totals, genre_rows, status_counts, platform_minutes, time_period, start_date
+            )
             
             if include_predictions:
-                analytics["predictions"] = _generate_predictions(user_games)
+                analytics["predictions"] = _generate_predictions(genre_rows, totals.avg_rating)
             
             return analytics
             
@@ -91,90 +170,76 @@ async def analyze_gaming_patterns(
         }
 
 
-def _calculate_gaming_analytics(user_games, time_period: str, start_date: Optional[datetime]) -> Dict[str, Any]:
-    """Calculate gaming analytics from user game data."""
-    if not user_games:
-        return {
-            "period": time_period,
-            "total_playtime_hours": 0,
-            "games_played": 0,
-            "new_games_started": 0,
-            "games_completed": 0,
-            "completion_rate_percent": 0,
-            "most_played_genre": None,
-            "patterns": {"trending_up": [], "trending_down": []},
-            "recommendations": []
-        }
-    
-    total_playtime = 0
-    games_played = 0
-    games_completed = 0
-    new_games_started = 0
-    genre_playtime = {}
-    status_counts = {}
-    platform_stats = {}
-    
-    for user_game, game, library, platform in user_games:
-        playtime_hours = user_game.total_playtime_minutes / 60
-        total_playtime += playtime_hours
-        
-        if playtime_hours > 0:
-            games_played += 1
-        
-        if user_game.game_status == "completed":
-            games_completed += 1
-        
-        # Check if game was started in the period
-        if start_date and user_game.first_played_at and user_game.first_played_at >= start_date:
-            new_games_started += 1
-        
-        # Genre analysis
-        if game.genres:
-            for genre in game.genres:
-                genre_playtime[genre] = genre_playtime.get(genre, 0) + playtime_hours
-        
-        # Status analysis
-        status_counts[user_game.game_status] = status_counts.get(user_game.game_status, 0) + 1
-        
-        # Platform analysis
-        platform_stats[platform.platform_code] = platform_stats.get(platform.platform_code, 0) + playtime_hours
+def _empty_analytics(time_period: str) -> AnalyticsResult:
+    """Analytics payload for a period with no games."""
+    return AnalyticsResult(
+        period=time_period,
+        total_playtime_hours=0,
+        games_played=0,
+        new_games_started=0,
+        games_completed=0,
+        completion_rate_percent=0,
+        most_played_genre=None,
+        patterns=TrendPatterns(trending_up=[], trending_down=[]),
+        recommendations=[]
+    )
+
+
+def _one_decimal(value: float) -> float:
+    """Round a non-negative value to one decimal, half up."""
+    # Plain arithmetic instead of round(), which dispatches through __round__
+    return int(value * 10 + 0.5) / 10
+
+
+def _calculate_gaming_analytics(
+    totals,
+    genre_rows,
+    status_counts: Dict[str, int],
+    platform_minutes: Dict[str, int],
+    time_period: str,
+    start_date: Optional[datetime]
+) -> AnalyticsResult:
+    """Build the analytics payload from aggregated totals and per-group rows."""
+    total_playtime = totals.playtime_minutes / 60
+    games_played = totals.games_played
+    games_completed = totals.games_completed
     
-    # Find most played genre
-    most_played_genre = max(genre_playtime.items(), key=lambda x: x[1])[0] if genre_playtime else None
+    # Genre rows arrive ordered by playtime, highest first
+    most_played_genre = genre_rows[0].genre if genre_rows else None
     
     # Calculate completion rate
-    completion_rate = (games_completed / len(user_games) * 100) if user_games else 0
+    completion_rate = games_completed / totals.game_count * 100
     
     # Generate insights
-    trending_genres = _analyze_trending_genres(user_games, start_date)
+    trending_genres = _analyze_trending_genres(genre_rows, start_date)
     
-    return {
-        "period": time_period,
-        "total_playtime_hours": round(total_playtime, 1),
-        "games_played": games_played,
-        "new_games_started": new_games_started,
-        "games_completed": games_completed,
-        "avg_session_duration_minutes": round((total_playtime * 60) / games_played, 1) if games_played else 0,
-        "most_played_genre": most_played_genre,
-        "completion_rate_percent": round(completion_rate, 1),
-        "games_by_status": status_counts,
-        "top_genres": [
-            {"genre": genre, "playtime_hours": round(hours, 1)}
-            for genre, hours in sorted(genre_playtime.items(), key=lambda x: x[1], reverse=True)[:5]
+    return AnalyticsResult(
+        period=time_period,
+        total_playtime_hours=_one_decimal(total_playtime),
+        games_played=games_played,
+        new_games_started=totals.new_games_started,
+        games_completed=games_completed,
+        avg_session_duration_minutes=_one_decimal(totals.playtime_minutes / games_played) if games_played else 0,
+        most_played_genre=most_played_genre,
+        completion_rate_percent=_one_decimal(completion_rate),
+        games_by_status=status_counts,
+        top_genres=[
+            GenrePlaytime(genre=row.genre, playtime_hours=_one_decimal(row.playtime_minutes / 60))
+            for row in genre_rows[:5]
         ],
-        "platform_distribution": {
-            platform: round(hours, 1)
-            for platform, hours in platform_stats.items()
-        },
-        "patterns": {
-            "trending_up": trending_genres["up"],
-            "trending_down": trending_genres["down"]
+        platform_distribution={
+            platform: _one_decimal(minutes / 60)
+            for platform, minutes in platform_minutes.items()
         },
-        "insights": _generate_insights(total_playtime, games_played, games_completed, most_played_genre)
-    }
+        patterns=TrendPatterns(
+            trending_up=trending_genres["up"],
+            trending_down=trending_genres["down"]
+        ),
+        insights=_generate_insights(total_playtime, games_played, games_completed, most_played_genre)
+    )
 
 
-def _analyze_trending_genres(user_games, start_date: Optional[datetime]) -> Dict[str, List[str]]:
+def _analyze_trending_genres(genre_rows, start_date: Optional[datetime]) -> Dict[str, List[str]]:
     """Analyze trending genres (simplified version)."""
     # This is a simplified version - in a real implementation, 
     # you'd compare current period to previous periods
@@ -182,15 +247,10 @@ def _analyze_trending_genres(user_games, start_date: Optional[datetime]) -> Dict
     if not start_date:
         return {"up": [], "down": []}
     
-    recent_genres = {}
-    for user_game, game, library, platform in user_games:
-        if user_game.last_played_at and user_game.last_played_at >= start_date:
-            if game.genres:
-                for genre in game.genres:
-                    recent_genres[genre] = recent_genres.get(genre, 0) + 1
-    
-    # Mock trending analysis
-    trending_up = [genre for genre, count in recent_genres.items() if count >= 2][:3]
+    # Mock trending analysis: genres played at least twice in the period, most played first.
+    # recent_count is a COUNT(*) FILTER on the genre rollup, so no extra query or pass is needed
+    recent = [row for row in genre_rows if row.recent_count >= 2]
+    trending_up = [row.genre for row in heapq.nlargest(3, recent, key=attrgetter("recent_count"))]
     
     return {
         "up": trending_up,
@@ -198,32 +258,13 @@ def _analyze_trending_genres(user_games, start_date: Optional[datetime]) -> Dict
     }
 
 
-def _generate_predictions(user_games) -> List[Dict[str, Any]]:
+def _generate_predictions(genre_rows, avg_rating: Optional[float]) -> List[Dict[str, Any]]:
     """Generate simple game recommendations based on patterns."""
     # This is a simplified version - in a real implementation,
     # you'd use machine learning models
     
-    if not user_games:
-        return []
-    
     # Analyze user preferences
-    preferred_genres = {}
-    avg_rating = 0
-    rating_count = 0
-    
-    for user_game, game, library, platform in user_games:
-        if game.genres:
-            for genre in game.genres:
-                preferred_genres[genre] = preferred_genres.get(genre, 0) + 1
-        
-        if user_game.user_rating:
-            avg_rating += user_game.user_rating
-            rating_count += 1
-    
-    if rating_count > 0:
-        avg_rating /= rating_count
-    
-    top_genre = max(preferred_genres.items(), key=lambda x: x[1])[0] if preferred_genres else "Action"
+    top_genre = max(genre_rows, key=attrgetter("game_count")).genre if genre_rows else "Action"
     
     # Generate mock recommendations
     recommendations = [
@@ -236,7 +277,7 @@ def _generate_predictions(user_games) -> List[Dict[str, Any]]:
         }
     ]
     
-    if avg_rating > 4:
+    if avg_rating and avg_rating > 4:
         recommendations.append({
             "type": "quality_match",
             "title": "High-Quality Games",
@@ -250,23 +291,15 @@ def _generate_predictions(user_games) -> List[Dict[str, Any]]:
 
 def _generate_insights(total_playtime: float, games_played: int, games_completed: int, most_played_genre: str) -> List[str]:
     """Generate textual insights about gaming patterns."""
-    insights = []
-    
-    if total_playtime > 50:
-        insights.append(f"You're an active gamer with {total_playtime:.1f} hours of playtime")
-    elif total_playtime > 20:
-        insights.append(f"You have moderate gaming activity with {total_playtime:.1f} hours")
-    else:
-        insights.append("You have light gaming activity - consider exploring new games")
+    # First band whose threshold the playtime exceeds
+    template = next(text for threshold, text in _PLAYTIME_INSIGHTS if total_playtime > threshold)
+    insights = [template.format(hours=total_playtime)]
     
     if games_completed > 0:
-        completion_rate = (games_completed / games_played) * 100 if games_played else 0
-        if completion_rate > 50:
-            insights.append("You're great at finishing games you start")
-        else:
-            insights.append("You might enjoy shorter games or focus on fewer titles")
+        finishes_most = games_played and games_completed / games_played > 0.5
+        insights.append(_COMPLETION_INSIGHTS[bool(finishes_most)])
     
     if most_played_genre:
         insights.append(f"Your favorite genre appears to be {most_played_genre}")
     
-    return insights
\ No newline at end of file
+    return insights
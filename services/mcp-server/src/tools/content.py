@@ -1,21 +1,104 @@
 """Content filtering MCP tools."""
 
 import logging
-from typing import Dict, Any, List, Optional
-from sqlalchemy import select, and_, or_, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, Final, List, Optional, Tuple
+from sqlalchemy import Row, String, select, or_, func, cast, literal_column, true
 
 from models import Game, UserGame, UserLibrary
 from database import get_session
+from ._cache import TTLCache
+from ._ids import parse_uuid
+from ._jsonb import contains_any
+from ._schemas import ContentFilterResult, FilterCriteria, RatingInfo
 
 logger = logging.getLogger(__name__)
 
+# ESRB rating hierarchy; matches games.esrb_rank
+RATING_HIERARCHY: Final[Dict[str, int]] = {
+    "E": 1,      # Everyone
+    "E10+": 2,   # Everyone 10+
+    "T": 3,      # Teen
+    "M": 4,      # Mature
+    "AO": 5,     # Adults Only
+    "RP": 0      # Rating Pending
+}
+
+# Ratings that pass each maximum (Rating Pending never does)
+ALLOWED_RATINGS_BY_MAX: Final[Dict[str, Tuple[str, ...]]] = {
+    max_rating: tuple(
+        rating for rating, value in RATING_HIERARCHY.items()
+        if 0 < value <= max_value
+    )
+    for max_rating, max_value in RATING_HIERARCHY.items()
+}
+
+RATING_GUIDE: Final[Dict[str, str]] = {
+    "E": "Everyone - Content suitable for all ages",
+    "E10+": "Everyone 10+ - Content suitable for ages 10 and older",
+    "T": "Teen - Content suitable for ages 13 and older", 
+    "M": "Mature - Content suitable for ages 17 and older",
+    "AO": "Adults Only - Content suitable only for adults",
+    "RP": "Rating Pending - Not yet rated"
+}
+
+RATING_DESCRIPTIONS: Final[Dict[str, str]] = {
+    "E": "Everyone - Content suitable for all ages. May contain minimal cartoon, fantasy or mild violence and/or infrequent use of mild language.",
+    "E10+": "Everyone 10+ - Content suitable for ages 10 and older. May contain more cartoon, fantasy or mild violence, mild language and/or minimal suggestive themes.",
+    "T": "Teen - Content suitable for ages 13 and older. May contain violence, suggestive themes, crude humor, minimal blood, simulated gambling and/or infrequent use of strong language.",
+    "M": "Mature 17+ - Content suitable for ages 17 and older. May contain intense violence, blood and gore, sexual themes and/or strong language.",
+    "AO": "Adults Only 18+ - Content suitable only for adults ages 18 and older. May include prolonged scenes of intense violence, graphic and sadistic torture, nudity with sexual content.",
+    "RP": "Rating Pending - Not yet assigned a final ESRB rating."
+}
+
+# Content warnings, keyed off the (uppercased) max rating
+_YOUNG_AUDIENCE_RATINGS: Final = frozenset({"E", "E10+"})
+_YOUNG_AUDIENCE_WARNINGS: Final = (
+    "Some games may have user-generated content not covered by ESRB ratings",
+    "Online interactions are not rated by the ESRB",
+)
+_NO_EXCLUSIONS_WARNING: Final = "No content descriptors were excluded - games may contain various content types"
+_RATING_PENDING_WARNING: Final = "Rating Pending games may receive different final ratings"
+
+# Result fields, already formatted by Postgres (string IDs, ISO dates, fallbacks),
+# labelled with their output keys so rows map straight onto result dicts
+_ESRB_OR_UNRATED = func.coalesce(cast(Game.esrb_rating, String), "Unrated")
+_EMPTY_JSONB_ARRAY = literal_column("'[]'::jsonb")
+_GAME_COLUMNS = (
+    cast(Game.game_id, String).label("game_id"),
+    Game.title,
+    _ESRB_OR_UNRATED.label("esrb_rating"),
+    func.coalesce(Game.esrb_descriptors, _EMPTY_JSONB_ARRAY).label("esrb_descriptors"),
+    func.coalesce(Game.genres, _EMPTY_JSONB_ARRAY).label("genres"),
+    Game.developer,
+    func.to_char(Game.release_date, "YYYY-MM-DD").label("release_date"),
+    Game.cover_image_url,
+    _ESRB_OR_UNRATED.label("safe_for_rating"),
+)
+_USER_GAME_COLUMNS = (
+    UserGame.owned.label("user_owned"),
+    UserGame.game_status.label("user_status"),
+    UserGame.total_playtime_minutes,
+)
+_GAME_FIELDS = tuple(column.key for column in _GAME_COLUMNS)
+_LIBRARY_GAME_FIELDS = _GAME_FIELDS + tuple(column.key for column in _USER_GAME_COLUMNS)
+
+# Catalog-wide results (no library_id) are the same for every caller; keep them briefly
+CATALOG_CACHE_TTL_SECONDS = 60
+_catalog_cache = TTLCache(ttl=CATALOG_CACHE_TTL_SECONDS, maxsize=256)
+
+
+def clear_catalog_cache() -> None:
+    """Drop cached catalog-wide filter results (call after games are added)."""
+    _catalog_cache.clear()
+
 
 async def filter_by_content_rating(
     max_rating: str,
     library_id: Optional[str] = None,
     exclude_descriptors: Optional[List[str]] = None,
-    include_unrated: bool = True
+    include_unrated: bool = True,
+    limit: int = 100,
+    offset: int = 0
 ) -> Dict[str, Any]:
     """
     Filter games by ESRB content ratings for family-friendly viewing.
@@ -25,117 +108,129 @@ async def filter_by_content_rating(
         library_id: Optional specific library to filter
         exclude_descriptors: Exclude games with specific content descriptors
         include_unrated: Include unrated games
+        limit: Max results per page (default: 100, max: 500)
+        offset: Number of results to skip
         
     Returns:
         Filtered games that meet content rating requirements
     """
     try:
-        # Define ESRB rating hierarchy
-        rating_hierarchy = {
-            "E": 1,      # Everyone
-            "E10+": 2,   # Everyone 10+
-            "T": 3,      # Teen
-            "M": 4,      # Mature
-            "AO": 5,     # Adults Only
-            "RP": 0      # Rating Pending
-        }
-        
-        max_rating_value = rating_hierarchy.get(max_rating.upper())
+        limit = min(limit, 500)  # Cap page size
+        max_rating_upper = max_rating.upper()
+        max_rating_value = RATING_HIERARCHY.get(max_rating_upper)
         if max_rating_value is None:
             return {
                 "error": f"Invalid ESRB rating '{max_rating}'",
-                "valid_ratings": list(rating_hierarchy.keys()),
-                "rating_guide": {
-                    "E": "Everyone - Content suitable for all ages",
-                    "E10+": "Everyone 10+ - Content suitable for ages 10 and older",
-                    "T": "Teen - Content suitable for ages 13 and older", 
-                    "M": "Mature - Content suitable for ages 17 and older",
-                    "AO": "Adults Only - Content suitable only for adults",
-                    "RP": "Rating Pending - Not yet rated"
-                }
+                "valid_ratings": list(RATING_HIERARCHY),
+                "rating_guide": RATING_GUIDE
             }
         
-        async for session in get_session():
-            # Build query based on whether we're filtering a specific library
-            if library_id:
-                # Filter user's library
-                query_base = select(Game, UserGame, UserLibrary).join(
-                    UserGame, Game.game_id == UserGame.game_id
-                ).join(
-                    UserLibrary, UserGame.library_id == UserLibrary.library_id
-                ).where(UserLibrary.library_id == library_id)
-            else:
-                # Filter all games
-                query_base = select(Game)
-            
+        library_uuid = None
+        if library_id:
+            library_uuid = parse_uuid(library_id)
+            if library_uuid is None:
+                return {
+                    "error": f"Invalid library ID '{library_id}'",
+                    "max_rating": max_rating,
+                    "library_id": library_id
+                }
+        
+        cache_key = None
+        if library_uuid is None:
+            cache_key = (
+                max_rating_upper, tuple(sorted(exclude_descriptors or ())), include_unrated, limit, offset
+            )
+            cached = _catalog_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        async with get_session() as session:
             conditions = []
             
-            # Rating filter
-            allowed_ratings = [
-                rating for rating, value in rating_hierarchy.items()
-                if value <= max_rating_value and value > 0
-            ]
-            
-            rating_conditions = [Game.esrb_rating.in_(allowed_ratings)]
+            # Rating filter: esrb_rank follows RATING_HIERARCHY; RP ranks 0 and is never allowed
+            rating_conditions = [Game.esrb_rank.between(1, max_rating_value)]
             
             if include_unrated:
-                rating_conditions.append(Game.esrb_rating.is_(None))
+                rating_conditions.append(Game.esrb_rank.is_(None))
             
             conditions.append(or_(*rating_conditions))
             
             # Exclude specific content descriptors
             if exclude_descriptors:
-                for descriptor in exclude_descriptors:
-                    # Check if the descriptor exists in the JSONB array
-                    conditions.append(
-                        ~Game.esrb_descriptors.op('?')(descriptor)
-                    )
+                conditions.append(~contains_any(Game.esrb_descriptors, exclude_descriptors))
             
-            # Apply all conditions
-            if conditions:
-                query_base = query_base.where(and_(*conditions))
+            if library_uuid:
+                # Filter user's library. The page is LEFT JOINed onto the library row, so
+                # one round trip returns no rows for an unknown library, a single all-NULL
+                # page row when nothing passes, and the library size on every row.
+                page = select(*_GAME_COLUMNS, *_USER_GAME_COLUMNS).join(
+                    UserGame, Game.game_id == UserGame.game_id
+                ).where(
+                    UserGame.library_id == library_uuid, *conditions
+                ).order_by(Game.title, Game.game_id).limit(limit).offset(offset).subquery("page")
+                total_in_library = select(func.count(UserGame.user_game_id)).where(
+                    UserGame.library_id == UserLibrary.library_id
+                ).scalar_subquery().label("total_in_library")
+                query_base = select(*page.c, total_in_library).select_from(UserLibrary).outerjoin(
+                    page, true()
+                ).where(UserLibrary.library_id == library_uuid).order_by(page.c.title, page.c.game_id)
+            else:
+                # Filter all games; the match count comes back on every row of the page,
+                # and (title, game_id) is a stable order so pages don't overlap
+                query_base = select(*_GAME_COLUMNS, func.count().over().label("total_matching")).where(
+                    *conditions
+                ).order_by(Game.title, Game.game_id).limit(limit).offset(offset)
             
             # Execute query
             result = await session.execute(query_base)
+            rows = result.all()
             
-            filtered_games = []
-            total_games_checked = 0
-            
-            if library_id:
-                # Process user games
-                rows = result.all()
-                total_games_checked = await _count_total_library_games(session, library_id)
+            if library_uuid:
+                if not rows:
+                    return {
+                        "error": f"Library with ID '{library_id}' not found",
+                        "max_rating": max_rating,
+                        "library_id": library_id
+                    }
                 
-                for game, user_game, library in rows:
-                    filtered_games.append(_format_filtered_game(game, user_game))
+                # Process user games
+                total_games_checked = rows[0].total_in_library
+                filtered_games = [
+                    _format_filtered_game(row, _LIBRARY_GAME_FIELDS) for row in rows
+                    if row.game_id is not None
+                ]
             else:
                 # Process all games
-                games = result.scalars().all()
-                total_games_checked = len(games)
-                
-                for game in games:
-                    filtered_games.append(_format_filtered_game(game))
+                total_games_checked = rows[0].total_matching if rows else 0
+                filtered_games = [_format_filtered_game(row, _GAME_FIELDS) for row in rows]
             
             # Generate content warnings
-            content_warnings = _generate_content_warnings(max_rating, exclude_descriptors)
+            content_warnings = _generate_content_warnings(max_rating_upper, exclude_descriptors)
             
-            return {
-                "filtered_games": filtered_games,
-                "filter_criteria": {
-                    "max_rating": max_rating.upper(),
-                    "excluded_descriptors": exclude_descriptors or [],
-                    "include_unrated": include_unrated,
-                    "total_games_filtered": total_games_checked,
-                    "games_passed_filter": len(filtered_games)
-                },
-                "content_warnings": content_warnings,
-                "rating_info": {
-                    "applied_rating": max_rating.upper(),
-                    "description": _get_rating_description(max_rating.upper()),
-                    "allowed_ratings": allowed_ratings
-                },
-                "summary": f"Found {len(filtered_games)} games suitable for {max_rating.upper()} rating from {total_games_checked} total games"
-            }
+            response = ContentFilterResult(
+                filtered_games=filtered_games,
+                filter_criteria=FilterCriteria(
+                    max_rating=max_rating_upper,
+                    excluded_descriptors=exclude_descriptors or [],
+                    include_unrated=include_unrated,
+                    total_games_filtered=total_games_checked,
+                    games_passed_filter=len(filtered_games),
+                    limit=limit,
+                    offset=offset
+                ),
+                content_warnings=content_warnings,
+                rating_info=RatingInfo(
+                    applied_rating=max_rating_upper,
+                    description=_get_rating_description(max_rating_upper),
+                    allowed_ratings=ALLOWED_RATINGS_BY_MAX[max_rating_upper]
+                ),
+                summary=f"Found {len(filtered_games)} games suitable for {max_rating_upper} rating from {total_games_checked} total games"
+            )
+            
+            if cache_key is not None:
+                _catalog_cache.set(cache_key, response)
+            
+            return response
             
     except Exception as e:
         logger.error(f"Error filtering by content rating: {e}")
@@ -146,75 +241,25 @@ async def filter_by_content_rating(
         }
 
 
-async def _count_total_library_games(session: AsyncSession, library_id: str) -> int:
-    """Count total games in a library."""
-    try:
-        count_result = await session.execute(
-            select(func.count(UserGame.user_game_id)).where(
-                UserGame.library_id == library_id
-            )
-        )
-        return count_result.scalar() or 0
-    except Exception:
-        return 0
-
-
-def _format_filtered_game(game: Game, user_game: Optional = None) -> Dict[str, Any]:
-    """Format game data for content filtering results."""
-    result = {
-        "game_id": str(game.game_id),
-        "title": game.title,
-        "esrb_rating": game.esrb_rating or "Unrated",
-        "esrb_descriptors": game.esrb_descriptors or [],
-        "genres": game.genres or [],
-        "developer": game.developer,
-        "release_date": game.release_date.isoformat() if game.release_date else None,
-        "cover_image_url": game.cover_image_url,
-        "safe_for_rating": game.esrb_rating or "Unrated"
-    }
-    
-    if user_game:
-        result["user_owned"] = user_game.owned
-        result["user_status"] = user_game.game_status
-        result["total_playtime_minutes"] = user_game.total_playtime_minutes
-    
-    return result
+def _format_filtered_game(row: Row, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Format a selected game row for content filtering results."""
+    # Trailing count columns fall off the end of the zip
+    return dict(zip(fields, row))
 
 
 def _generate_content_warnings(max_rating: str, exclude_descriptors: Optional[List[str]]) -> List[str]:
     """Generate content warnings for filtered results."""
-    warnings = []
+    warnings = list(_YOUNG_AUDIENCE_WARNINGS) if max_rating in _YOUNG_AUDIENCE_RATINGS else []
     
-    if max_rating.upper() in ["E", "E10+"]:
-        warnings.append(
-            "Some games may have user-generated content not covered by ESRB ratings"
-        )
-        warnings.append(
-            "Online interactions are not rated by the ESRB"
-        )
+    if not exclude_descriptors:
+        warnings.append(_NO_EXCLUSIONS_WARNING)
     
-    if not exclude_descriptors or len(exclude_descriptors) == 0:
-        warnings.append(
-            "No content descriptors were excluded - games may contain various content types"
-        )
-    
-    if max_rating.upper() == "RP":
-        warnings.append(
-            "Rating Pending games may receive different final ratings"
-        )
+    if max_rating == "RP":
+        warnings.append(_RATING_PENDING_WARNING)
     
     return warnings
 
 
 def _get_rating_description(rating: str) -> str:
     """Get description for ESRB rating."""
-    descriptions = {
-        "E": "Everyone - Content suitable for all ages. May contain minimal cartoon, fantasy or mild violence and/or infrequent use of mild language.",
-        "E10+": "Everyone 10+ - Content suitable for ages 10 and older. May contain more cartoon, fantasy or mild violence, mild language and/or minimal suggestive themes.",
-        "T": "Teen - Content suitable for ages 13 and older. May contain violence, suggestive themes, crude humor, minimal blood, simulated gambling and/or infrequent use of strong language.",
-        "M": "Mature 17+ - Content suitable for ages 17 and older. May contain intense violence, blood and gore, sexual themes and/or strong language.",
-        "AO": "Adults Only 18+ - Content suitable only for adults ages 18 and older. May include prolonged scenes of intense violence, graphic and sadistic torture, nudity with sexual content.",
-        "RP": "Rating Pending - Not yet assigned a final ESRB rating."
-    }
-    
-    return descriptions.get(rating, "Unknown rating")
\ No newline at end of file
+    return RATING_DESCRIPTIONS.get(rating, "Unknown rating")
@@ -1,15 +1,115 @@
 """Game search and details MCP tools."""
 
+import base64
+import json
 import logging
-from typing import Dict, Any, List, Optional
-from sqlalchemy import select, and_, or_, func
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID as PyUUID
+from sqlalchemy import JSON, Float, Numeric, Row, String, select, and_, or_, func, any_, bindparam, case, cast, literal, literal_column, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Game, UserGame, UserLibrary, Platform
 from database import get_session
+from ._ids import UUID_ARRAY, parse_uuid
+from ._jsonb import contains_any
 
 logger = logging.getLogger(__name__)
 
+# Text search configuration used to build games.search_vector
+SEARCH_CONFIG = "english"
+
+# Rows fetched per round trip when streaming search results
+SEARCH_FETCH_SIZE = 50
+
+# Search result fields, already formatted by Postgres (string IDs, ISO dates, fallbacks)
+# and labelled with their output keys, so no ORM instances are built for search rows
+_EMPTY_JSONB_ARRAY = literal_column("'[]'::jsonb")
+_SEARCH_COLUMNS = (
+    cast(Game.game_id, String).label("game_id"),
+    Game.title,
+    Game.developer,
+    Game.publisher,
+    func.to_char(Game.release_date, "YYYY-MM-DD").label("release_date"),
+    func.coalesce(Game.genres, _EMPTY_JSONB_ARRAY).label("genres"),
+    Game.esrb_rating,
+    Game.metacritic_score,
+    Game.steam_score,
+    Game.cover_image_url,
+    func.coalesce(Game.platforms_available, _EMPTY_JSONB_ARRAY).label("platforms_available"),
+)
+_OWNED_COLUMNS = (
+    func.jsonb_build_array(Platform.platform_code).label("owned_platforms"),
+    UserGame.game_status.label("user_status"),
+    UserGame.user_rating,
+    cast(func.round(cast(UserGame.total_playtime_minutes, Numeric) / 60, 1), Float).label("total_playtime_hours"),
+    UserLibrary.display_name.label("library_name"),
+)
+_SEARCH_FIELDS = tuple(column.key for column in _SEARCH_COLUMNS)
+_OWNED_SEARCH_FIELDS = _SEARCH_FIELDS + tuple(column.key for column in _OWNED_COLUMNS)
+
+# get_game_details payloads, built as JSON by Postgres; json_build_object (not jsonb)
+# keeps the keys in the order given here
+_GAME_DETAILS = func.json_build_object(
+    "game_id", Game.game_id,
+    "title", Game.title,
+    "slug", Game.slug,
+    "description", Game.description,
+    "short_description", Game.short_description,
+    "developer", Game.developer,
+    "publisher", Game.publisher,
+    "release_date", func.to_char(Game.release_date, "YYYY-MM-DD"),
+    "genres", func.coalesce(Game.genres, _EMPTY_JSONB_ARRAY),
+    "tags", func.coalesce(Game.tags, _EMPTY_JSONB_ARRAY),
+    "platforms_available", func.coalesce(Game.platforms_available, _EMPTY_JSONB_ARRAY),
+    "esrb_rating", Game.esrb_rating,
+    "esrb_descriptors", func.coalesce(Game.esrb_descriptors, _EMPTY_JSONB_ARRAY),
+    "pegi_rating", Game.pegi_rating,
+    "metacritic_score", Game.metacritic_score,
+    "metacritic_url", Game.metacritic_url,
+    "steam_score", Game.steam_score,
+    "steam_review_count", Game.steam_review_count,
+    "media", func.json_build_object(
+        "cover_image_url", Game.cover_image_url,
+        "background_image_url", Game.background_image_url,
+        "screenshots", func.coalesce(Game.screenshots, _EMPTY_JSONB_ARRAY),
+        "videos", func.coalesce(Game.videos, _EMPTY_JSONB_ARRAY),
+    ),
+    "external_ids", func.json_build_object(
+        "steam_appid", Game.steam_appid,
+        "gog_id", Game.gog_id,
+        "epic_id", Game.epic_id,
+        "xbox_id", Game.xbox_id,
+        "psn_id", Game.psn_id,
+    ),
+    "website_url", Game.website_url,
+    "playtime_estimates", func.json_build_object(
+        "main_hours", Game.playtime_main_hours,
+        "completionist_hours", Game.playtime_completionist_hours,
+    ),
+    "created_at", Game.created_at,
+    "updated_at", Game.updated_at,
+    type_=JSON,
+)
+# NULL when the game is not in the requested library (outer join found no row)
+_USER_DATA = case(
+    (UserGame.user_game_id.is_not(None), func.json_build_object(
+        "owned", UserGame.owned,
+        "total_playtime_minutes", UserGame.total_playtime_minutes,
+        "total_playtime_hours", func.round(cast(UserGame.total_playtime_minutes, Numeric) / 60, 1),
+        "last_played_at", UserGame.last_played_at,
+        "first_played_at", UserGame.first_played_at,
+        "game_status", UserGame.game_status,
+        "user_rating", UserGame.user_rating,
+        "is_favorite", UserGame.is_favorite,
+        "user_notes", UserGame.user_notes,
+        "platform", Platform.platform_code,
+        "platform_name", Platform.platform_name,
+        "library_name", UserLibrary.display_name,
+        type_=JSON,
+    )),
+    else_=None,
+)
+
 
 async def search_games(
     query: str,
@@ -18,7 +118,8 @@ async def search_games(
     rating_filter: Optional[Dict[str, int]] = None,
     genre_filter: Optional[List[str]] = None,
     owned_only: bool = False,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Search for games across all platforms and libraries.
@@ -31,44 +132,63 @@ async def search_games(
         genre_filter: Filter by genres
         owned_only: Show only owned games
         limit: Max results (default: 20, max: 100)
+        cursor: next_cursor from the previous page, to continue after it
         
     Returns:
-        Search results with games and metadata
+        Search results with games and metadata. total_results is only
+        computed for the first page (no cursor).
     """
     try:
         limit = min(limit, 100)  # Cap at 100 results
         
-        async for session in get_session():
+        # Keyset columns after relevance; owned rows repeat a game once per library
+        # that owns it, so user_game_id is needed to make the order unique
+        key_columns = [Game.title, Game.game_id]
+        if owned_only:
+            key_columns.append(UserGame.user_game_id)
+        
+        position = None
+        if cursor:
+            position = _decode_cursor(cursor)
+            if position is None or len(position["key"]) != len(key_columns):
+                return {
+                    "error": "Invalid cursor",
+                    "games": [],
+                    "total_results": 0,
+                    "search_query": query
+                }
+        
+        async with get_session() as session:
             # Build the base query
             if owned_only:
                 # Search in user games (owned only)
-                query_base = select(Game, UserGame, UserLibrary, Platform).join(
-                    UserGame, Game.game_id == UserGame.game_id
+                query_base = select(*_SEARCH_COLUMNS, *_OWNED_COLUMNS).select_from(UserGame).join(
+                    Game, UserGame.game_id == Game.game_id
                 ).join(
                     UserLibrary, UserGame.library_id == UserLibrary.library_id
                 ).join(
                     Platform, UserLibrary.platform_id == Platform.platform_id
-                )
+                ).add_columns(cast(UserGame.user_game_id, String).label("user_game_id"))
+                fields = _OWNED_SEARCH_FIELDS
             else:
-                # Search all games
-                query_base = select(Game).outerjoin(
-                    UserGame, Game.game_id == UserGame.game_id
-                ).outerjoin(
-                    UserLibrary, UserGame.library_id == UserLibrary.library_id
-                ).outerjoin(
-                    Platform, UserLibrary.platform_id == Platform.platform_id
-                )
+                # Search all games; user data is never read here, so no joins
+                query_base = select(*_SEARCH_COLUMNS)
+                fields = _SEARCH_FIELDS
             
             conditions = []
             
-            # Text search
+            # Text search: full-text over the generated search_vector, plus substring
+            # matches on the short columns; every branch is served by a GIN index
+            ts_query = None
             if query.strip():
+                ts_query = func.plainto_tsquery(SEARCH_CONFIG, query)
+                # One bound pattern shared by every ILIKE (sent once, not per column)
+                pattern = bindparam("search_pattern", f"%{query}%", type_=String)
                 search_condition = or_(
-                    Game.title.ilike(f"%{query}%"),
-                    Game.normalized_title.ilike(f"%{query}%"),
-                    Game.developer.ilike(f"%{query}%"),
-                    Game.publisher.ilike(f"%{query}%"),
-                    Game.description.ilike(f"%{query}%")
+                    Game.search_vector.op("@@")(ts_query),
+                    Game.title.ilike(pattern),
+                    Game.developer.ilike(pattern),
+                    Game.publisher.ilike(pattern)
                 )
                 conditions.append(search_condition)
             
@@ -78,21 +198,11 @@ async def search_games(
                     conditions.append(Platform.platform_code.in_(platform_filter))
                 else:
                     # For all games, check platforms_available JSONB
-                    platform_conditions = []
-                    for platform in platform_filter:
-                        platform_conditions.append(
-                            Game.platforms_available.op('?')(platform)
-                        )
-                    if platform_conditions:
-                        conditions.append(or_(*platform_conditions))
+                    conditions.append(contains_any(Game.platforms_available, platform_filter))
             
             # Genre filter
             if genre_filter:
-                genre_conditions = []
-                for genre in genre_filter:
-                    genre_conditions.append(Game.genres.op('?')(genre))
-                if genre_conditions:
-                    conditions.append(or_(*genre_conditions))
+                conditions.append(contains_any(Game.genres, genre_filter))
             
             # Rating filter
             if rating_filter:
@@ -107,28 +217,52 @@ async def search_games(
             if status_filter and owned_only:
                 conditions.append(UserGame.game_status.in_(status_filter))
             
+            # Keyset order: relevance first when searching, then the key columns
+            rank = func.ts_rank(Game.search_vector, ts_query) if ts_query is not None else literal(0.0)
+            if position is not None:
+                after_title = tuple_(*key_columns) > tuple(position["key"])
+                if ts_query is not None:
+                    after_title = or_(
+                        rank < position["rank"],
+                        and_(rank == position["rank"], after_title)
+                    )
+                conditions.append(after_title)
+            
             # Apply all conditions
             if conditions:
                 query_base = query_base.where(and_(*conditions))
             
-            # Add ordering
-            query_base = query_base.order_by(Game.title).limit(limit)
+            query_base = query_base.add_columns(rank.label("search_rank"))
+            
+            # Count every match on the first page only; later pages seek past the
+            # cursor and can stop after `limit + 1` rows
+            if position is None:
+                query_base = query_base.add_columns(func.count().over().label("total_matching"))
             
-            # Execute query
-            result = await session.execute(query_base)
+            # Add ordering (most relevant first when searching)
+            if ts_query is not None:
+                query_base = query_base.order_by(rank.desc())
+            # One row past the page tells whether another page exists
+            query_base = query_base.order_by(*key_columns).limit(limit + 1)
+            
+            # Stream rows from a server-side cursor, formatting each chunk as it arrives
+            # instead of buffering every Row alongside the result dicts
+            result = await session.stream(query_base.execution_options(yield_per=SEARCH_FETCH_SIZE))
             
             games = []
-            if owned_only:
-                rows = result.all()
-                for game, user_game, library, platform in rows:
-                    games.append(_format_game_result(game, user_game, library, platform))
-            else:
-                game_rows = result.scalars().all()
-                for game in game_rows:
-                    games.append(_format_game_result(game))
+            total_count = 0 if position is None else None
+            last_row = None
+            has_more = False
+            async for row in result:
+                if len(games) == limit:
+                    has_more = True
+                    break
+                if last_row is None and position is None:
+                    total_count = row.total_matching
+                games.append(_format_game_result(row, fields))
+                last_row = row
             
-            # Get total count (simplified)
-            total_count = len(games)
+            next_cursor = _encode_cursor(last_row) if has_more else None
             
             return {
                 "games": games,
@@ -142,6 +276,7 @@ async def search_games(
                     "owned_only": owned_only
                 },
                 "results_count": len(games),
+                "next_cursor": next_cursor,
                 "search_time_ms": 0  # TODO: Add actual timing
             }
             
@@ -170,99 +305,36 @@ async def get_game_details(
         Detailed game information
     """
     try:
-        async for session in get_session():
-            # Get the game
-            game_result = await session.execute(
-                select(Game).where(Game.game_id == game_id)
-            )
-            game = game_result.scalar_one_or_none()
+        # Bind UUIDs, not strings, so asyncpg sends them with its native uuid codec
+        game_uuid = parse_uuid(game_id)
+        if game_uuid is None:
+            return {
+                "error": f"Invalid game ID '{game_id}'",
+                "game_id": game_id
+            }
+        
+        library_uuid = None
+        if library_id:
+            library_uuid = parse_uuid(library_id)
+            if library_uuid is None:
+                return {
+                    "error": f"Invalid library ID '{library_id}'",
+                    "game_id": game_id,
+                    "library_id": library_id
+                }
+        
+        async with get_session() as session:
+            # Fetch the game and, when a library is given, its user data in one round trip
+            game_query = _game_details_query(library_uuid).where(Game.game_id == game_uuid)
+            game_row = (await session.execute(game_query)).first()
             
-            if not game:
+            if not game_row:
                 return {
                     "error": f"Game with ID '{game_id}' not found",
                     "suggestion": "Use search_games to find games and get their IDs"
                 }
             
-            # Get user data if library_id provided
-            user_data = None
-            if library_id:
-                user_game_result = await session.execute(
-                    select(UserGame, UserLibrary, Platform).join(
-                        UserLibrary, UserGame.library_id == UserLibrary.library_id
-                    ).join(
-                        Platform, UserLibrary.platform_id == Platform.platform_id
-                    ).where(
-                        and_(
-                            UserGame.game_id == game_id,
-                            UserGame.library_id == library_id
-                        )
-                    )
-                )
-                user_game_row = user_game_result.first()
-                
-                if user_game_row:
-                    user_game, library, platform = user_game_row
-                    user_data = {
-                        "owned": user_game.owned,
-                        "total_playtime_minutes": user_game.total_playtime_minutes,
-                        "total_playtime_hours": round(user_game.total_playtime_minutes / 60, 1),
-                        "last_played_at": user_game.last_played_at.isoformat() if user_game.last_played_at else None,
-                        "first_played_at": user_game.first_played_at.isoformat() if user_game.first_played_at else None,
-                        "game_status": user_game.game_status,
-                        "user_rating": user_game.user_rating,
-                        "is_favorite": user_game.is_favorite,
-                        "user_notes": user_game.user_notes,
-                        "platform": platform.platform_code,
-                        "platform_name": platform.platform_name,
-                        "library_name": library.display_name
-                    }
-            
-            # Format game details
-            game_details = {
-                "game_id": str(game.game_id),
-                "title": game.title,
-                "slug": game.slug,
-                "description": game.description,
-                "short_description": game.short_description,
-                "developer": game.developer,
-                "publisher": game.publisher,
-                "release_date": game.release_date.isoformat() if game.release_date else None,
-                "genres": game.genres or [],
-                "tags": game.tags or [],
-                "platforms_available": game.platforms_available or [],
-                "esrb_rating": game.esrb_rating,
-                "esrb_descriptors": game.esrb_descriptors or [],
-                "pegi_rating": game.pegi_rating,
-                "metacritic_score": game.metacritic_score,
-                "metacritic_url": game.metacritic_url,
-                "steam_score": game.steam_score,
-                "steam_review_count": game.steam_review_count,
-                "media": {
-                    "cover_image_url": game.cover_image_url,
-                    "background_image_url": game.background_image_url,
-                    "screenshots": game.screenshots or [],
-                    "videos": game.videos or []
-                },
-                "external_ids": {
-                    "steam_appid": game.steam_appid,
-                    "gog_id": game.gog_id,
-                    "epic_id": game.epic_id,
-                    "xbox_id": game.xbox_id,
-                    "psn_id": game.psn_id
-                },
-                "website_url": game.website_url,
-                "playtime_estimates": {
-                    "main_hours": game.playtime_main_hours,
-                    "completionist_hours": game.playtime_completionist_hours
-                },
-                "created_at": game.created_at.isoformat(),
-                "updated_at": game.updated_at.isoformat()
-            }
-            
-            if user_data:
-                game_details["user_data"] = user_data
-            
-            return game_details
+            return _merge_user_data(game_row)
             
     except Exception as e:
         logger.error(f"Error getting game details for {game_id}: {e}")
@@ -272,27 +344,114 @@ async def get_game_details(
         }
 
 
-def _format_game_result(game: Game, user_game: Optional = None, library: Optional = None, platform: Optional = None) -> Dict[str, Any]:
-    """Format game data for search results."""
-    result = {
-        "game_id": str(game.game_id),
-        "title": game.title,
-        "developer": game.developer,
-        "publisher": game.publisher,
-        "release_date": game.release_date.isoformat() if game.release_date else None,
-        "genres": game.genres or [],
-        "esrb_rating": game.esrb_rating,
-        "metacritic_score": game.metacritic_score,
-        "steam_score": game.steam_score,
-        "cover_image_url": game.cover_image_url,
-        "platforms_available": game.platforms_available or []
-    }
-    
-    if user_game and library and platform:
-        result["owned_platforms"] = [platform.platform_code]
-        result["user_status"] = user_game.game_status
-        result["user_rating"] = user_game.user_rating
-        result["total_playtime_hours"] = round(user_game.total_playtime_minutes / 60, 1)
-        result["library_name"] = library.display_name
+async def get_games_by_ids(
+    game_ids: List[str],
+    library_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get details for several games in one query.
     
-    return result
\ No newline at end of file
+    Args:
+        game_ids: UUIDs of the games (e.g. from search_games results)
+        library_id: Optional library ID to include user-specific data
+        
+    Returns:
+        Game details keyed by game_id, plus the IDs that were not found
+    """
+    try:
+        game_uuids = [parse_uuid(game_id) for game_id in game_ids]
+        invalid_ids = [game_id for game_id, game_uuid in zip(game_ids, game_uuids) if game_uuid is None]
+        if invalid_ids:
+            return {
+                "error": f"Invalid game IDs: {', '.join(invalid_ids)}",
+                "games": {},
+                "not_found": []
+            }
+        
+        library_uuid = None
+        if library_id:
+            library_uuid = parse_uuid(library_id)
+            if library_uuid is None:
+                return {
+                    "error": f"Invalid library ID '{library_id}'",
+                    "games": {},
+                    "not_found": []
+                }
+        
+        async with get_session() as session:
+            # One statement for the whole batch; the IDs bind as a single uuid[] parameter
+            games_query = _game_details_query(library_uuid).where(
+                Game.game_id == any_(literal(game_uuids, UUID_ARRAY))
+            )
+            games = {
+                game_details["game_id"]: game_details
+                for game_details in map(_merge_user_data, (await session.execute(games_query)).all())
+            }
+            
+            return {
+                "games": games,
+                "not_found": [str(game_uuid) for game_uuid in game_uuids if str(game_uuid) not in games]
+            }
+            
+    except Exception as e:
+        logger.error(f"Error getting game details for {len(game_ids)} games: {e}")
+        return {
+            "error": f"Failed to get game details: {str(e)}",
+            "games": {},
+            "not_found": []
+        }
+
+
+def _game_details_query(library_id: Optional[PyUUID]):
+    """Select the game details payload (and user_data when a library is given)."""
+    # Postgres builds both payloads, so no ORM instances are loaded
+    game_query = select(_GAME_DETAILS)
+    if library_id:
+        game_query = game_query.add_columns(_USER_DATA).outerjoin(
+            UserGame,
+            and_(
+                UserGame.game_id == Game.game_id,
+                UserGame.library_id == library_id
+            )
+        ).outerjoin(
+            UserLibrary, UserGame.library_id == UserLibrary.library_id
+        ).outerjoin(
+            Platform, UserLibrary.platform_id == Platform.platform_id
+        )
+    return game_query
+
+
+def _merge_user_data(game_row: Row) -> Dict[str, Any]:
+    """Attach user_data to the game payload if the game is in the requested library."""
+    game_details = game_row[0]
+    if len(game_row) > 1 and game_row[1] is not None:
+        game_details["user_data"] = game_row[1]
+    return game_details
+
+
+def _encode_cursor(row: Row) -> str:
+    """Build the opaque cursor that continues after a search row."""
+    position = [row.search_rank, row.title, row.game_id]
+    if "user_game_id" in row._fields:
+        position.append(row.user_game_id)
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    """Parse a search cursor, returning None if it is malformed."""
+    try:
+        rank, title, *ids = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        return None
+    uuids = [parse_uuid(value) for value in ids]
+    if not 1 <= len(uuids) <= 2 or None in uuids:
+        return None
+    if not isinstance(title, str) or not isinstance(rank, (int, float)):
+        return None
+    # Seek key: (title, game_id), plus user_game_id for owned-only searches
+    return {"rank": rank, "key": (title, *uuids)}
+
+
+def _format_game_result(row: Row, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Map a search row onto its result dict (trailing total_matching is dropped)."""
+    return dict(zip(fields, row))
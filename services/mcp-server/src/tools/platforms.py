@@ -2,14 +2,36 @@
 
 import logging
 from typing import Dict, Any, List
-from sqlalchemy import select
+from sqlalchemy import func, lambda_stmt, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Platform, UserLibrary
 from database import get_session
+from ._cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Fixed-shape statements: built and cache-keyed once, so each call skips
+# statement construction and goes straight to the compiled cache
+_ALL_PLATFORMS = select(Platform)
+
+# Codes a library can be added for, reported when an unknown platform is requested
+_AVAILABLE_CODES = select(
+    func.array_agg(aggregate_order_by(Platform.platform_code, Platform.platform_code)).label("codes")
+).where(
+    or_(Platform.api_available, Platform.platform_code == "manual")
+).subquery("available")
+
+# Platforms are seeded reference data and change only through migrations
+PLATFORMS_CACHE_TTL_SECONDS = 60
+_platforms_cache = TTLCache(ttl=PLATFORMS_CACHE_TTL_SECONDS, maxsize=1)
+
+
+def clear_platforms_cache() -> None:
+    """Drop the cached platform list (call after platforms are changed)."""
+    _platforms_cache.clear()
+
 
 async def get_supported_platforms() -> Dict[str, Any]:
     """
@@ -17,10 +39,14 @@ async def get_supported_platforms() -> Dict[str, Any]:
     
     Returns platforms with their availability status and setup requirements.
     """
+    cached = _platforms_cache.get(None)
+    if cached is not None:
+        return cached
+    
     try:
-        async for session in get_session():
+        async with get_session() as session:
             # Get all platforms from database
-            result = await session.execute(select(Platform))
+            result = await session.execute(_ALL_PLATFORMS)
             platforms = result.scalars().all()
             
             platform_list = []
@@ -35,12 +61,14 @@ async def get_supported_platforms() -> Dict[str, Any]:
                     "status": "available" if platform.api_available else "coming_soon"
                 })
             
-            return {
+            response = {
                 "platforms": platform_list,
                 "total": len(platform_list),
                 "available_count": sum(1 for p in platform_list if p["api_available"]),
                 "primary_platform": "steam"  # Phase 1 focus
             }
+            _platforms_cache.set(None, response)
+            return response
             
     except Exception as e:
         logger.error(f"Error getting supported platforms: {e}")
@@ -70,17 +98,21 @@ async def add_platform_library(
         Library creation result with library_id
     """
     try:
-        async for session in get_session():
-            # Find the platform
+        async with get_session() as session:
+            # Find the platform; the available codes come back on the same (always present) row
             platform_result = await session.execute(
-                select(Platform).where(Platform.platform_code == platform_code)
+                lambda_stmt(lambda: select(Platform, _AVAILABLE_CODES.c.codes).select_from(
+                    _AVAILABLE_CODES
+                ).outerjoin(
+                    Platform, Platform.platform_code == platform_code
+                ))
             )
-            platform = platform_result.scalar_one_or_none()
+            platform, available_codes = platform_result.one()
             
             if not platform:
                 return {
                     "error": f"Platform '{platform_code}' not found",
-                    "available_platforms": ["steam", "xbox", "gog", "epic", "playstation", "manual"]
+                    "available_platforms": available_codes or []
                 }
             
             if not platform.api_available and platform_code != "manual":
@@ -89,35 +121,37 @@ async def add_platform_library(
                     "status": "coming_soon"
                 }
             
-            # Check if library already exists
-            existing_result = await session.execute(
-                select(UserLibrary).where(
-                    UserLibrary.platform_id == platform.platform_id,
-                    UserLibrary.user_identifier == user_identifier
-                )
+            # Create the library unless this platform user already has one; the unique
+            # (platform_id, user_identifier) index makes check-and-insert one atomic statement
+            platform_id = platform.platform_id
+            insert_result = await session.execute(
+                insert(UserLibrary).values(
+                    platform_id=platform_id,
+                    user_identifier=user_identifier,
+                    display_name=display_name,
+                    api_credentials=credentials or {},
+                    sync_enabled=True,
+                    sync_status="pending"
+                ).on_conflict_do_nothing(
+                    index_elements=[UserLibrary.platform_id, UserLibrary.user_identifier]
+                ).returning(UserLibrary.library_id, UserLibrary.created_at)
             )
-            existing_library = existing_result.scalar_one_or_none()
+            new_library = insert_result.first()
             
-            if existing_library:
+            if new_library is None:
+                existing_result = await session.execute(
+                    lambda_stmt(lambda: select(UserLibrary.library_id, UserLibrary.display_name).where(
+                        UserLibrary.platform_id == platform_id,
+                        UserLibrary.user_identifier == user_identifier
+                    ))
+                )
+                existing_library = existing_result.one()
                 return {
                     "error": f"Library for {platform_code} user '{user_identifier}' already exists",
                     "existing_library_id": str(existing_library.library_id),
                     "display_name": existing_library.display_name
                 }
             
-            # Create new library
-            new_library = UserLibrary(
-                platform_id=platform.platform_id,
-                user_identifier=user_identifier,
-                display_name=display_name,
-                api_credentials=credentials or {},
-                sync_enabled=True,
-                sync_status="pending"
-            )
-            
-            session.add(new_library)
-            await session.flush()  # Get the ID
-            
             logger.info(f"Created library for {platform_code} user {user_identifier}")
             
             return {
@@ -1,15 +1,39 @@
 """Game recommendation MCP tools."""
 
 import logging
-from typing import Dict, Any, List, Optional
-from sqlalchemy import select, and_, or_, func
+from functools import lru_cache
+from typing import Dict, Any, Final, FrozenSet, List, NamedTuple, Optional, Tuple
+from sqlalchemy import ColumnElement, Float, Row, Select, select, and_, or_, func, true, bindparam, case, literal
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Game, UserGame, UserLibrary, Platform
 from database import get_session
+from .content import ALLOWED_RATINGS_BY_MAX
+from ._jsonb import contains_any, jsonb_array_param, jsonb_array_value
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per server-side cursor round trip when streaming candidates
+CANDIDATE_FETCH_SIZE = 50
+
+# Game columns read when scoring candidates, fetched as plain rows rather than
+# hydrated Game objects; the large text/JSONB columns (description, tags,
+# screenshots, videos, search_vector) are never fetched
+_CANDIDATE_COLUMNS = (
+    Game.game_id,
+    Game.title,
+    Game.developer,
+    Game.publisher,
+    Game.genres,
+    Game.metacritic_score,
+    Game.steam_score,
+    Game.playtime_main_hours,
+    Game.release_date,
+    Game.cover_image_url,
+    Game.esrb_rating,
+)
+
 
 async def recommend_games(
     library_id: Optional[str] = None,
@@ -33,97 +57,32 @@ async def recommend_games(
         limit = min(limit, 50)  # Cap at 50 recommendations
         criteria = criteria or {}
         
-        async for session in get_session():
+        async with get_session() as session:
             # Analyze user preferences if library_id provided
             user_preferences = {}
             if library_id:
                 user_preferences = await _analyze_user_preferences(session, library_id)
             
-            # Build recommendation query
-            query_conditions = []
-            
-            # Base game query
-            query_base = select(Game)
-            
-            # Exclude owned games if requested
-            if not include_owned and library_id:
-                # Subquery to get owned game IDs
-                owned_games_subquery = select(UserGame.game_id).where(
-                    UserGame.library_id == library_id
-                )
-                query_conditions.append(~Game.game_id.in_(owned_games_subquery))
+            # The statement is built once per shape (which filters and preference
+            # signals are present); values are bound at execution time
+            shape, params = _recommendation_shape(
+                library_id, criteria, limit, include_owned, user_preferences
+            )
             
-            # Apply criteria filters
-            if criteria.get("genres"):
-                genre_conditions = []
-                for genre in criteria["genres"]:
-                    genre_conditions.append(Game.genres.op('?')(genre))
-                if genre_conditions:
-                    query_conditions.append(or_(*genre_conditions))
+            # Rows arrive ranked; scoring here only fills in the reasons and match factors.
+            # Lookup sets are built once rather than per candidate
+            genre_weights = user_preferences.get("genre_weights", {})
+            preferred_developers = frozenset(user_preferences.get("preferred_developers", ()))
+            requested_genres = frozenset(criteria.get("genres") or ())
             
-            if criteria.get("max_playtime_hours"):
-                max_hours = criteria["max_playtime_hours"]
-                query_conditions.append(
-                    or_(
-                        Game.playtime_main_hours <= max_hours,
-                        Game.playtime_main_hours.is_(None)
-                    )
+            # Stream candidates from a server-side cursor and score each as it arrives
+            result = await session.stream(_recommendation_query(shape), params)
+            recommendations = [
+                _score_game_recommendation(
+                    game, user_preferences, genre_weights, preferred_developers, requested_genres
                 )
-            
-            if criteria.get("min_rating"):
-                min_score = criteria["min_rating"]
-                query_conditions.append(
-                    or_(
-                        Game.metacritic_score >= min_score,
-                        Game.steam_score >= min_score
-                    )
-                )
-            
-            if criteria.get("platforms"):
-                platform_conditions = []
-                for platform in criteria["platforms"]:
-                    platform_conditions.append(Game.platforms_available.op('?')(platform))
-                if platform_conditions:
-                    query_conditions.append(or_(*platform_conditions))
-            
-            # Apply ESRB rating filter if specified
-            if criteria.get("max_esrb_rating"):
-                rating_hierarchy = {"E": 1, "E10+": 2, "T": 3, "M": 4}
-                max_rating_value = rating_hierarchy.get(criteria["max_esrb_rating"])
-                if max_rating_value:
-                    allowed_ratings = [
-                        rating for rating, value in rating_hierarchy.items()
-                        if value <= max_rating_value
-                    ]
-                    query_conditions.append(
-                        or_(
-                            Game.esrb_rating.in_(allowed_ratings),
-                            Game.esrb_rating.is_(None)
-                        )
-                    )
-            
-            # Apply all conditions
-            if query_conditions:
-                query_base = query_base.where(and_(*query_conditions))
-            
-            # Order by recommendation score (simplified - would use ML in production)
-            query_base = query_base.order_by(
-                Game.metacritic_score.desc().nulls_last(),
-                Game.steam_score.desc().nulls_last(),
-                Game.release_date.desc().nulls_last()
-            ).limit(limit * 2)  # Get more candidates for scoring
-            
-            result = await session.execute(query_base)
-            candidate_games = result.scalars().all()
-            
-            # Score and rank recommendations
-            recommendations = []
-            for game in candidate_games[:limit]:
-                recommendation = _score_game_recommendation(game, user_preferences, criteria)
-                recommendations.append(recommendation)
-            
-            # Sort by recommendation score
-            recommendations.sort(key=lambda x: x["recommendation_score"], reverse=True)
+                async for game in result
+            ]
             
             # Generate recommendation basis
             basis = _generate_recommendation_basis(user_preferences, criteria, library_id)
@@ -132,7 +91,7 @@ async def recommend_games(
                 "recommendations": recommendations,
                 "recommendation_basis": basis,
                 "criteria_applied": criteria,
-                "total_candidates_analyzed": len(candidate_games),
+                "total_candidates_analyzed": len(recommendations),
                 "user_preferences": user_preferences if library_id else None,
                 "limit": limit,
                 "include_owned": include_owned
@@ -150,67 +109,71 @@ async def recommend_games(
 async def _analyze_user_preferences(session: AsyncSession, library_id: str) -> Dict[str, Any]:
     """Analyze user preferences from their game library."""
     try:
-        # Get user's games with ratings and playtime
-        result = await session.execute(
-            select(UserGame, Game).join(
+        # Aggregate server-side; only the reduced rows come back
+        totals = (await session.execute(
+            select(
+                func.count().label("game_count"),
+                func.coalesce(func.sum(UserGame.total_playtime_minutes), 0).label("playtime_minutes"),
+                func.count().filter(UserGame.game_status == "completed").label("completed_games"),
+                func.count().filter(UserGame.is_favorite).label("favorite_count"),
+                # Unset (NULL or 0) scores don't count towards the averages
+                func.avg(func.nullif(Game.metacritic_score, 0)).label("avg_metacritic"),
+                func.avg(func.nullif(UserGame.user_rating, 0)).label("avg_user_rating"),
+            ).select_from(UserGame).join(
                 Game, UserGame.game_id == Game.game_id
             ).where(UserGame.library_id == library_id)
-        )
-        
-        user_games = result.all()
+        )).one()
         
-        if not user_games:
+        if not totals.game_count:
             return {}
         
-        # Analyze preferences
-        genre_scores = {}
-        developer_scores = {}
-        avg_metacritic = []
-        avg_user_rating = []
-        total_playtime = 0
-        completed_games = 0
-        favorite_count = 0
+        # Genre preferences (weighted by playtime and rating, unrated counts as 3)
+        genre = func.jsonb_array_elements_text(Game.genres).table_valued("value").lateral("genre")
+        genre_weight = func.sum(
+            UserGame.total_playtime_minutes / 60.0 * func.coalesce(func.nullif(UserGame.user_rating, 0), 3)
+        )
+        genre_rows = (await session.execute(
+            select(genre.c.value, genre_weight.label("weight")).select_from(UserGame).join(
+                Game, UserGame.game_id == Game.game_id
+            ).join(
+                genre, true()
+            ).where(
+                UserGame.library_id == library_id
+            ).group_by(genre.c.value).order_by(genre_weight.desc().nulls_last(), genre.c.value).limit(5)
+        )).all()
+        preferred_genres = [row.value for row in genre_rows]
         
-        for user_game, game in user_games:
-            # Genre preferences (weighted by playtime and rating)
-            if game.genres:
-                weight = (user_game.total_playtime_minutes / 60) * (user_game.user_rating or 3)
-                for genre in game.genres:
-                    genre_scores[genre] = genre_scores.get(genre, 0) + weight
-            
-            # Developer preferences
-            if game.developer:
-                developer_scores[game.developer] = developer_scores.get(game.developer, 0) + 1
-            
-            # Rating preferences
-            if game.metacritic_score:
-                avg_metacritic.append(game.metacritic_score)
-            if user_game.user_rating:
-                avg_user_rating.append(user_game.user_rating)
-            
-            # Playtime and completion patterns
-            total_playtime += user_game.total_playtime_minutes
-            if user_game.game_status == "completed":
-                completed_games += 1
-            if user_game.is_favorite:
-                favorite_count += 1
+        # Share of the top genres' weight held by each; equal shares when
+        # nothing has been played yet
+        total_weight = sum(float(row.weight or 0) for row in genre_rows)
+        genre_weights = {
+            row.value: float(row.weight or 0) / total_weight if total_weight else 1 / len(genre_rows)
+            for row in genre_rows
+        }
         
-        # Calculate preferences
-        preferred_genres = sorted(genre_scores.items(), key=lambda x: x[1], reverse=True)[:5]
-        preferred_developers = sorted(developer_scores.items(), key=lambda x: x[1], reverse=True)[:3]
+        # Developer preferences
+        preferred_developers = (await session.execute(
+            select(Game.developer).select_from(UserGame).join(
+                Game, UserGame.game_id == Game.game_id
+            ).where(
+                UserGame.library_id == library_id,
+                Game.developer.is_not(None),
+                Game.developer != ""
+            ).group_by(Game.developer).order_by(func.count().desc(), Game.developer).limit(3)
+        )).scalars().all()
         
-        avg_playtime_hours = total_playtime / 60 / len(user_games) if user_games else 0
-        completion_rate = completed_games / len(user_games) if user_games else 0
+        game_count = totals.game_count
         
         return {
-            "preferred_genres": [genre for genre, score in preferred_genres],
-            "preferred_developers": [dev for dev, count in preferred_developers],
-            "avg_metacritic_preference": sum(avg_metacritic) / len(avg_metacritic) if avg_metacritic else 75,
-            "avg_user_rating": sum(avg_user_rating) / len(avg_user_rating) if avg_user_rating else 3.5,
-            "avg_playtime_hours": avg_playtime_hours,
-            "completion_rate": completion_rate,
-            "total_games": len(user_games),
-            "favorite_percentage": favorite_count / len(user_games) if user_games else 0
+            "preferred_genres": preferred_genres,
+            "genre_weights": genre_weights,
+            "preferred_developers": list(preferred_developers),
+            "avg_metacritic_preference": float(totals.avg_metacritic) if totals.avg_metacritic is not None else 75,
+            "avg_user_rating": float(totals.avg_user_rating) if totals.avg_user_rating is not None else 3.5,
+            "avg_playtime_hours": totals.playtime_minutes / 60 / game_count,
+            "completion_rate": totals.completed_games / game_count,
+            "total_games": game_count,
+            "favorite_percentage": totals.favorite_count / game_count
         }
         
     except Exception as e:
@@ -218,10 +181,209 @@ async def _analyze_user_preferences(session: AsyncSession, library_id: str) -> D
         return {}
 
 
+# Ratings allowed under each accepted max_esrb_rating value, from the shared ESRB hierarchy
+_ESRB_ALLOWED: Final[Dict[str, Tuple[str, ...]]] = {
+    max_rating: ALLOWED_RATINGS_BY_MAX[max_rating]
+    for max_rating in ("E", "E10+", "T", "M")
+}
+
+
+class _RecommendationShape(NamedTuple):
+    """Structural variant of the recommendation query; one cached statement per shape."""
+    exclude_owned: bool
+    genres: bool
+    max_playtime: bool
+    min_rating: bool
+    platforms: bool
+    esrb: bool
+    preferred_genre_count: int
+    preferred_developers: bool
+    preferred_playtime: bool
+
+
+def _recommendation_shape(
+    library_id: Optional[str],
+    criteria: Dict[str, Any],
+    limit: int,
+    include_owned: bool,
+    user_preferences: Dict[str, Any]
+) -> Tuple[_RecommendationShape, Dict[str, Any]]:
+    """Work out the query shape for a request and the values to bind into it."""
+    params = {
+        "limit": limit,
+        "preferred_metacritic": float(user_preferences.get("avg_metacritic_preference", 75)),
+    }
+    
+    exclude_owned = bool(library_id) and not include_owned
+    if exclude_owned:
+        params["library_id"] = library_id
+    
+    if criteria.get("genres"):
+        params["genres"] = jsonb_array_value(criteria["genres"])
+    if criteria.get("max_playtime_hours"):
+        params["max_playtime_hours"] = criteria["max_playtime_hours"]
+    if criteria.get("min_rating"):
+        params["min_rating"] = criteria["min_rating"]
+    if criteria.get("platforms"):
+        params["platforms"] = jsonb_array_value(criteria["platforms"])
+    
+    allowed_ratings = _ESRB_ALLOWED.get(criteria.get("max_esrb_rating"))
+    if allowed_ratings:
+        params["allowed_ratings"] = allowed_ratings
+    
+    genre_weights = user_preferences.get("genre_weights") or {}
+    for index, (genre, weight) in enumerate(genre_weights.items()):
+        params[f"preferred_genre_{index}"] = [genre]
+        params[f"preferred_genre_weight_{index}"] = weight
+    
+    preferred_developers = user_preferences.get("preferred_developers") or []
+    if preferred_developers:
+        params["preferred_developers"] = list(preferred_developers)
+    
+    preferred_playtime = user_preferences.get("avg_playtime_hours", 20)
+    if preferred_playtime:
+        params["preferred_playtime"] = float(preferred_playtime)
+    
+    shape = _RecommendationShape(
+        exclude_owned=exclude_owned,
+        genres="genres" in params,
+        max_playtime="max_playtime_hours" in params,
+        min_rating="min_rating" in params,
+        platforms="platforms" in params,
+        esrb="allowed_ratings" in params,
+        preferred_genre_count=len(genre_weights),
+        preferred_developers="preferred_developers" in params,
+        preferred_playtime="preferred_playtime" in params,
+    )
+    return shape, params
+
+
+@lru_cache(maxsize=256)
+def _recommendation_query(shape: _RecommendationShape) -> Select:
+    """Build the candidate query for a shape, with named parameters for all values."""
+    query_conditions = []
+    
+    # Exclude owned games if requested
+    if shape.exclude_owned:
+        owned_games_subquery = select(UserGame.game_id).where(
+            UserGame.library_id == bindparam("library_id")
+        )
+        query_conditions.append(~Game.game_id.in_(owned_games_subquery))
+    
+    # Apply criteria filters
+    if shape.genres:
+        query_conditions.append(contains_any(Game.genres, jsonb_array_param("genres")))
+    
+    if shape.max_playtime:
+        query_conditions.append(
+            or_(
+                Game.playtime_main_hours <= bindparam("max_playtime_hours", type_=Float),
+                Game.playtime_main_hours.is_(None)
+            )
+        )
+    
+    if shape.min_rating:
+        min_score = bindparam("min_rating", type_=Float)
+        query_conditions.append(
+            or_(
+                Game.metacritic_score >= min_score,
+                Game.steam_score >= min_score
+            )
+        )
+    
+    if shape.platforms:
+        query_conditions.append(contains_any(Game.platforms_available, jsonb_array_param("platforms")))
+    
+    if shape.esrb:
+        query_conditions.append(
+            or_(
+                Game.esrb_rating.in_(bindparam("allowed_ratings", expanding=True)),
+                Game.esrb_rating.is_(None)
+            )
+        )
+    
+    query_base = select(*_CANDIDATE_COLUMNS)
+    if query_conditions:
+        query_base = query_base.where(and_(*query_conditions))
+    
+    # Rank by recommendation score in SQL so only the top `limit` rows come back;
+    # ties fall back to the critic/user score and release date ordering
+    return query_base.order_by(
+        _recommendation_score_expr(shape).desc(),
+        Game.metacritic_score.desc().nulls_last(),
+        Game.steam_score.desc().nulls_last(),
+        Game.release_date.desc().nulls_last()
+    ).limit(bindparam("limit")).execution_options(yield_per=CANDIDATE_FETCH_SIZE)
+
+
+def _recommendation_score_expr(shape: _RecommendationShape) -> ColumnElement[float]:
+    """
+    Build the SQL equivalent of the score computed by _score_game_recommendation.
+    
+    Must be kept in step with the Python scorer, which still produces the
+    reported score and reasons for the returned rows.
+    """
+    score = literal(0.5, Float)
+    
+    # Genre matching: summed preference weight of the preferred genres the game has
+    if shape.preferred_genre_count:
+        matched = sum(
+            case(
+                (
+                    Game.genres.op("@>")(bindparam(f"preferred_genre_{index}", type_=JSONB)),
+                    bindparam(f"preferred_genre_weight_{index}", type_=Float)
+                ),
+                else_=0
+            )
+            for index in range(shape.preferred_genre_count)
+        )
+        score = score + matched * 0.3
+    
+    # Developer matching
+    if shape.preferred_developers:
+        score = score + case(
+            (Game.developer.in_(bindparam("preferred_developers", expanding=True)), 0.2),
+            else_=0
+        )
+    
+    # Rating proximity (unset scores contribute nothing)
+    preferred_metacritic = bindparam("preferred_metacritic", type_=Float)
+    score = score + case(
+        (
+            Game.metacritic_score > 0,
+            func.greatest(0, 1 - func.abs(Game.metacritic_score - preferred_metacritic) / 50) * 0.2
+        ),
+        else_=0
+    )
+    
+    # Playtime proximity
+    if shape.preferred_playtime:
+        preferred_hours = bindparam("preferred_playtime", type_=Float)
+        score = score + case(
+            (
+                Game.playtime_main_hours > 0,
+                func.greatest(0, 1 - func.abs(Game.playtime_main_hours - preferred_hours) / preferred_hours) * 0.1
+            ),
+            else_=0
+        )
+    
+    # Criteria matching
+    if shape.genres:
+        score = score + case((contains_any(Game.genres, jsonb_array_param("genres")), 0.1), else_=0)
+    
+    # Quality and popularity bonuses
+    score = score + case((Game.metacritic_score >= 85, 0.1), else_=0)
+    score = score + case((Game.steam_score >= 90, 0.05), else_=0)
+    
+    return func.least(score, 1.0)
+
+
 def _score_game_recommendation(
-    game: Game, 
+    game: Row, 
     user_preferences: Dict[str, Any], 
-    criteria: Dict[str, Any]
+    genre_weights: Dict[str, float],
+    preferred_developers: FrozenSet[str],
+    requested_genres: FrozenSet[str]
 ) -> Dict[str, Any]:
     """Score a game for recommendation based on user preferences and criteria."""
     base_score = 0.5
@@ -230,10 +392,10 @@ def _score_game_recommendation(
     
     # Genre matching
     genre_match = 0.0
-    if game.genres and user_preferences.get("preferred_genres"):
-        matching_genres = set(game.genres) & set(user_preferences["preferred_genres"])
+    if game.genres and genre_weights:
+        matching_genres = [genre for genre in game.genres if genre in genre_weights]
         if matching_genres:
-            genre_match = len(matching_genres) / len(user_preferences["preferred_genres"])
+            genre_match = sum(genre_weights[genre] for genre in matching_genres)
             base_score += genre_match * 0.3
             reasons.append(f"Matches your preferred genres: {', '.join(matching_genres)}")
     
@@ -241,7 +403,7 @@ def _score_game_recommendation(
     
     # Developer matching
     developer_match = 0.0
-    if game.developer and game.developer in user_preferences.get("preferred_developers", []):
+    if game.developer and game.developer in preferred_developers:
         developer_match = 0.8
         base_score += 0.2
         reasons.append(f"From {game.developer}, a developer you've enjoyed")
@@ -265,7 +427,7 @@ def _score_game_recommendation(
     # Playtime matching
     playtime_match = 0.0
     preferred_playtime = user_preferences.get("avg_playtime_hours", 20)
-    if game.playtime_main_hours:
+    if game.playtime_main_hours and preferred_playtime:
         # Games similar to user's average playtime get bonus
         diff = abs(game.playtime_main_hours - preferred_playtime)
         playtime_match = max(0, 1 - (diff / preferred_playtime))
@@ -277,8 +439,8 @@ def _score_game_recommendation(
     match_factors["playtime_match"] = round(playtime_match, 2)
     
     # Criteria matching
-    if criteria.get("genres") and game.genres:
-        matching_criteria_genres = set(game.genres) & set(criteria["genres"])
+    if requested_genres and game.genres:
+        matching_criteria_genres = [genre for genre in game.genres if genre in requested_genres]
         if matching_criteria_genres:
             base_score += 0.1
             reasons.append(f"Matches requested genres: {', '.join(matching_criteria_genres)}")
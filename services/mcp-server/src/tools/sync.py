@@ -2,16 +2,30 @@
 
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-from sqlalchemy import select
+from types import MappingProxyType
+from sqlalchemy import any_, case, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Platform, UserLibrary, SyncOperation
+from models.base import uuid7
 from database import get_session
+from ._ids import UUID_ARRAY, parse_uuid
 
 logger = logging.getLogger(__name__)
 
+# Estimated sync durations in minutes, by platform and sync type
+_BASE_SYNC_TIMES = MappingProxyType({
+    "steam": {"full_sync": 15, "incremental_sync": 5, "manual_sync": 2},
+    "xbox": {"full_sync": 20, "incremental_sync": 7, "manual_sync": 3},
+    "gog": {"full_sync": 10, "incremental_sync": 4, "manual_sync": 2},
+    "epic": {"full_sync": 8, "incremental_sync": 3, "manual_sync": 1},
+    "playstation": {"full_sync": 25, "incremental_sync": 8, "manual_sync": 3},
+    "manual": {"full_sync": 1, "incremental_sync": 1, "manual_sync": 1},
+})
+_DEFAULT_SYNC_TIMES = MappingProxyType({})
+
 
 async def sync_platform_library(
     library_id: str,
@@ -30,12 +44,14 @@ async def sync_platform_library(
         Sync operation result with operation_id and status
     """
     try:
-        async for session in get_session():
-            # Find the library
+        async with get_session() as session:
+            # Find the library together with its platform in one round trip
             library_result = await session.execute(
-                select(UserLibrary).where(UserLibrary.library_id == library_id)
+                select(UserLibrary, Platform).outerjoin(
+                    Platform, UserLibrary.platform_id == Platform.platform_id
+                ).where(UserLibrary.library_id == library_id)
             )
-            library = library_result.scalar_one_or_none()
+            library, platform = library_result.one_or_none() or (None, None)
             
             if not library:
                 return {
@@ -43,65 +59,39 @@ async def sync_platform_library(
                     "suggestion": "Check the library_id or use get_supported_platforms to list available libraries"
                 }
             
-            # Get platform info
-            platform_result = await session.execute(
-                select(Platform).where(Platform.platform_id == library.platform_id)
-            )
-            platform = platform_result.scalar_one_or_none()
+            sync_error = _check_sync_allowed(library, platform, library_id, force)
+            if sync_error:
+                return sync_error
             
-            if not platform:
-                return {
-                    "error": "Platform not found for this library",
-                    "library_id": library_id
-                }
+            # Manual libraries have nothing to fetch, so their sync completes immediately
+            now = datetime.utcnow()
+            completes_now = platform.platform_code == "manual"
             
-            # Check if sync is already in progress
-            if library.sync_status == "in_progress" and not force:
-                return {
-                    "error": "Library sync is already in progress",
-                    "library_id": library_id,
-                    "current_status": library.sync_status,
-                    "last_sync_at": library.last_sync_at.isoformat() if library.last_sync_at else None,
-                    "force_option": "Use force=true to cancel current sync and start new one"
-                }
+            # Record the sync operation and update the library status in one statement:
+            # the library UPDATE runs as a data-modifying CTE of the INSERT. With a CTE
+            # attached, Python-side column defaults are not applied, so the key is set here.
+            library_update = update(UserLibrary).where(
+                UserLibrary.library_id == library.library_id
+            ).values(
+                sync_status="completed" if completes_now else "in_progress",
+                last_sync_at=now
+            ).returning(UserLibrary.library_id).cte("library_update")
             
-            # Check if platform API is available
-            if not platform.api_available and platform.platform_code != "manual":
-                return {
-                    "error": f"Platform '{platform.platform_code}' API is not yet available",
-                    "platform_name": platform.platform_name,
-                    "status": "coming_soon"
-                }
-            
-            # For Steam, check if we have API key
-            if platform.platform_code == "steam":
-                steam_api_key = os.getenv("STEAM_API_KEY")
-                if not steam_api_key:
-                    return {
-                        "error": "Steam API key not configured",
-                        "platform": "steam",
-                        "suggestion": "Set STEAM_API_KEY environment variable"
-                    }
-            
-            # Create sync operation record
-            sync_operation = SyncOperation(
-                library_id=library.library_id,
-                operation_type=sync_type,
-                status="started",
-                started_at=datetime.utcnow(),
-                games_processed=0,
-                games_added=0,
-                games_updated=0,
-                errors_count=0
+            operation_result = await session.execute(
+                insert(SyncOperation).values(
+                    operation_id=uuid7(),
+                    library_id=library.library_id,
+                    operation_type=sync_type,
+                    status="completed" if completes_now else "started",
+                    started_at=now,
+                    completed_at=now if completes_now else None,
+                    games_processed=0,
+                    games_added=0,
+                    games_updated=0,
+                    errors_count=0
+                ).returning(SyncOperation.operation_id).add_cte(library_update)
             )
-            
-            session.add(sync_operation)
-            
-            # Update library status
-            library.sync_status = "in_progress"
-            library.last_sync_at = datetime.utcnow()
-            
-            await session.flush()  # Get the operation ID
+            operation_id = operation_result.scalar_one()
             
             logger.info(f"Starting {sync_type} for library {library_id} ({platform.platform_code})")
             
@@ -109,19 +99,15 @@ async def sync_platform_library(
             # For now, we'll return a mock response indicating sync started
             
             # Simulate quick sync completion for demo
-            if platform.platform_code == "manual":
-                sync_operation.status = "completed"
-                sync_operation.completed_at = datetime.utcnow()
-                library.sync_status = "completed"
-                
+            if completes_now:
                 return {
-                    "operation_id": str(sync_operation.operation_id),
+                    "operation_id": str(operation_id),
                     "library_id": library_id,
                     "platform": platform.platform_code,
                     "status": "completed",
                     "operation_type": sync_type,
-                    "started_at": sync_operation.started_at.isoformat(),
-                    "completed_at": sync_operation.completed_at.isoformat(),
+                    "started_at": now.isoformat(),
+                    "completed_at": now.isoformat(),
                     "games_processed": 0,
                     "games_added": 0,
                     "games_updated": 0,
@@ -130,13 +116,13 @@ async def sync_platform_library(
             
             # For other platforms, return sync started status
             return {
-                "operation_id": str(sync_operation.operation_id),
+                "operation_id": str(operation_id),
                 "library_id": library_id,
                 "platform": platform.platform_code,
                 "platform_name": platform.platform_name,
                 "status": "started",
                 "operation_type": sync_type,
-                "started_at": sync_operation.started_at.isoformat(),
+                "started_at": now.isoformat(),
                 "estimated_duration_minutes": _estimate_sync_duration(platform.platform_code, sync_type),
                 "games_processed": 0,
                 "games_added": 0,
@@ -158,15 +144,170 @@ async def sync_platform_library(
         }
 
 
+async def sync_platform_libraries(
+    library_ids: List[str],
+    force: bool = False,
+    sync_type: str = "incremental_sync"
+) -> Dict[str, Any]:
+    """
+    Trigger synchronization for several platform libraries at once.
+    
+    Args:
+        library_ids: UUIDs of the libraries to sync
+        force: Force sync even if recently synced
+        sync_type: Type of sync (full_sync, incremental_sync, manual_sync)
+        
+    Returns:
+        Started operations keyed by library_id, per-library errors, and the IDs that were not found
+    """
+    try:
+        library_uuids = [parse_uuid(library_id) for library_id in library_ids]
+        invalid_ids = [
+            library_id for library_id, library_uuid in zip(library_ids, library_uuids)
+            if library_uuid is None
+        ]
+        if invalid_ids:
+            return {
+                "error": f"Invalid library IDs: {', '.join(invalid_ids)}",
+                "operations": {},
+                "errors": {},
+                "not_found": []
+            }
+        
+        async with get_session() as session:
+            # One lookup for the whole batch; the IDs bind as a single uuid[] parameter
+            library_result = await session.execute(
+                select(UserLibrary, Platform).outerjoin(
+                    Platform, UserLibrary.platform_id == Platform.platform_id
+                ).where(UserLibrary.library_id == any_(literal(library_uuids, UUID_ARRAY)))
+            )
+            
+            errors = {}
+            eligible = []
+            found_ids = set()
+            for library, platform in library_result.all():
+                library_id = str(library.library_id)
+                found_ids.add(library_id)
+                sync_error = _check_sync_allowed(library, platform, library_id, force)
+                if sync_error:
+                    errors[library_id] = sync_error
+                else:
+                    eligible.append((library, platform))
+            
+            not_found = [str(library_uuid) for library_uuid in library_uuids if str(library_uuid) not in found_ids]
+            
+            operations = {}
+            if eligible:
+                now = datetime.utcnow()
+                manual_ids = [library.library_id for library, platform in eligible if platform.platform_code == "manual"]
+                
+                # One multi-row INSERT for every operation and one UPDATE for every library
+                operation_result = await session.execute(
+                    insert(SyncOperation).returning(SyncOperation.library_id, SyncOperation.operation_id),
+                    [
+                        {
+                            "library_id": library.library_id,
+                            "operation_type": sync_type,
+                            "status": "completed" if platform.platform_code == "manual" else "started",
+                            "started_at": now,
+                            "completed_at": now if platform.platform_code == "manual" else None,
+                            "games_processed": 0,
+                            "games_added": 0,
+                            "games_updated": 0,
+                            "errors_count": 0
+                        }
+                        for library, platform in eligible
+                    ]
+                )
+                operation_ids = {str(row.library_id): row.operation_id for row in operation_result}
+                
+                await session.execute(
+                    update(UserLibrary).where(
+                        UserLibrary.library_id == any_(literal([library.library_id for library, _ in eligible], UUID_ARRAY))
+                    ).values(
+                        sync_status=case(
+                            (UserLibrary.library_id == any_(literal(manual_ids, UUID_ARRAY)), "completed"),
+                            else_="in_progress"
+                        ),
+                        last_sync_at=now
+                    )
+                )
+                
+                for library, platform in eligible:
+                    library_id = str(library.library_id)
+                    completes_now = platform.platform_code == "manual"
+                    operations[library_id] = {
+                        "operation_id": str(operation_ids[library_id]),
+                        "platform": platform.platform_code,
+                        "status": "completed" if completes_now else "started",
+                        "operation_type": sync_type,
+                        "started_at": now.isoformat(),
+                        "completed_at": now.isoformat() if completes_now else None,
+                        "estimated_duration_minutes": 0 if completes_now else _estimate_sync_duration(platform.platform_code, sync_type)
+                    }
+            
+            logger.info(f"Started {sync_type} for {len(operations)} of {len(library_ids)} libraries")
+            
+            return {
+                "operations": operations,
+                "errors": errors,
+                "not_found": not_found
+            }
+            
+    except Exception as e:
+        logger.error(f"Error starting sync for {len(library_ids)} libraries: {e}")
+        return {
+            "error": f"Failed to start sync: {str(e)}",
+            "operations": {},
+            "errors": {},
+            "not_found": []
+        }
+
+
+def _check_sync_allowed(
+    library: UserLibrary,
+    platform: Optional[Platform],
+    library_id: str,
+    force: bool
+) -> Optional[Dict[str, Any]]:
+    """Return the error response if the library cannot be synced now, else None."""
+    if not platform:
+        return {
+            "error": "Platform not found for this library",
+            "library_id": library_id
+        }
+    
+    # Check if sync is already in progress
+    if library.sync_status == "in_progress" and not force:
+        return {
+            "error": "Library sync is already in progress",
+            "library_id": library_id,
+            "current_status": library.sync_status,
+            "last_sync_at": library.last_sync_at.isoformat() if library.last_sync_at else None,
+            "force_option": "Use force=true to cancel current sync and start new one"
+        }
+    
+    # Check if platform API is available
+    if not platform.api_available and platform.platform_code != "manual":
+        return {
+            "error": f"Platform '{platform.platform_code}' API is not yet available",
+            "platform_name": platform.platform_name,
+            "status": "coming_soon"
+        }
+    
+    # For Steam, check if we have API key
+    if platform.platform_code == "steam":
+        steam_api_key = os.getenv("STEAM_API_KEY")
+        if not steam_api_key:
+            return {
+                "error": "Steam API key not configured",
+                "platform": "steam",
+                "suggestion": "Set STEAM_API_KEY environment variable"
+            }
+    
+    return None
+
+
 def _estimate_sync_duration(platform_code: str, sync_type: str) -> int:
     """Estimate sync duration in minutes based on platform and sync type."""
-    base_times = {
-        "steam": {"full_sync": 15, "incremental_sync": 5, "manual_sync": 2},
-        "xbox": {"full_sync": 20, "incremental_sync": 7, "manual_sync": 3},
-        "gog": {"full_sync": 10, "incremental_sync": 4, "manual_sync": 2},
-        "epic": {"full_sync": 8, "incremental_sync": 3, "manual_sync": 1},
-        "playstation": {"full_sync": 25, "incremental_sync": 8, "manual_sync": 3},
-        "manual": {"full_sync": 1, "incremental_sync": 1, "manual_sync": 1},
-    }
-    
-    return base_times.get(platform_code, {}).get(sync_type, 5)
\ No newline at end of file
+    return _BASE_SYNC_TIMES.get(platform_code, _DEFAULT_SYNC_TIMES).get(sync_type, 5)
@@ -1,31 +1,28 @@
 """Test configuration and fixtures for MCP server tests."""
 
-import asyncio
+import os
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 
-from database.connection import get_session, engine as global_engine
+from database import use_session
 from models import Base
 
 
 # Test database URL (in-memory SQLite)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+# PostgreSQL database initialized with database/schema.sql, for tests of
+# PostgreSQL-only statements (postgresql+asyncpg://...); unset skips them
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
 
-
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(loop_scope="function")
 async def test_engine():
-    """Create a test database engine."""
+    """Create a private in-memory database engine and schema for each test."""
     engine = create_async_engine(
         TEST_DATABASE_URL,
         poolclass=StaticPool,
@@ -33,6 +30,15 @@ async def test_engine():
         echo=False,
     )
     
+    # Let SQLAlchemy issue BEGIN itself so SAVEPOINTs work under pysqlite
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -43,48 +49,77 @@ async def test_engine():
     await engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(loop_scope="function")
 async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async_session = async_sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
-    )
+    """
+    Create a test database session.
     
-    async with async_session() as session:
-        yield session
+    The session runs inside an outer transaction that is rolled back after the
+    test; its commits only release SAVEPOINTs, so tests never see each other's data.
+    """
+    async with test_engine.connect() as conn:
+        outer_transaction = await conn.begin()
+        async with AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
+        await outer_transaction.rollback()
 
 
-@pytest_asyncio.fixture(scope="function")
-async def override_get_session(test_session):
-    """Override the get_session dependency for testing."""
-    async def _get_test_session():
-        yield test_session
-    
-    # Store original function
-    original_get_session = get_session
+@pytest.fixture
+def bulk_insert(test_session):
+    """
+    Insert test rows for a model in one executemany round trip.
     
-    # Replace with test session
-    import database.connection
-    database.connection.get_session = _get_test_session
+    Skips ORM unit-of-work bookkeeping; use ORM instances only where a test
+    needs the objects themselves.
+    """
+    async def _bulk_insert(model, rows):
+        await test_session.execute(insert(model), rows)
     
-    # Import tools after overriding the session
+    return _bulk_insert
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def override_get_session(test_session):
+    """Route get_session() to the test session for the current test."""
     import tools.platforms
-    import tools.games
-    import tools.sync
-    import tools.analytics
-    import tools.recommendations
     import tools.content
     
-    # Reload modules to use new session
-    import importlib
-    importlib.reload(tools.platforms)
-    importlib.reload(tools.games)
-    importlib.reload(tools.sync)
-    importlib.reload(tools.analytics)
-    importlib.reload(tools.recommendations)
-    importlib.reload(tools.content)
+    # Module-level caches would otherwise carry results between tests
+    tools.platforms.clear_platforms_cache()
+    tools.content.clear_catalog_cache()
+    
+    # Context-local override: nothing module-level is patched, so tests can run
+    # in parallel processes (pytest-xdist) and in any order
+    with use_session(test_session):
+        yield
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def pg_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session on TEST_POSTGRES_URL that get_session() is routed to.
     
-    yield
+    Like test_session, everything the test writes is rolled back afterwards.
+    Skips the test when TEST_POSTGRES_URL is not set.
+    """
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
     
-    # Restore original function
-    database.connection.get_session = original_get_session
\ No newline at end of file
+    engine = create_async_engine(TEST_POSTGRES_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            outer_transaction = await conn.begin()
+            async with AsyncSession(
+                bind=conn,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint",
+            ) as session:
+                with use_session(session):
+                    yield session
+            await outer_transaction.rollback()
+    finally:
+        await engine.dispose()
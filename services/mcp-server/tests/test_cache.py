@@ -0,0 +1,35 @@
+"""Tests for the in-process TTL cache used by MCP tools."""
+
+from tools._cache import TTLCache
+
+
+def test_ttl_cache_copies_value_on_set():
+    """Test that mutating a stored value does not change the cached entry."""
+    cache = TTLCache(ttl=60)
+    platforms = {"platforms": [{"platform_code": "steam"}], "total": 1}
+    
+    cache.set("platforms", platforms)
+    platforms["platforms"].clear()
+    platforms["total"] = 0
+    
+    assert cache.get("platforms") == {"platforms": [{"platform_code": "steam"}], "total": 1}
+
+
+def test_ttl_cache_copies_value_on_get():
+    """Test that mutating a returned value does not change the cached entry."""
+    cache = TTLCache(ttl=60)
+    cache.set("platforms", {"platforms": [{"platform_code": "steam"}], "total": 1})
+    
+    first = cache.get("platforms")
+    first["platforms"].clear()
+    first["total"] = 0
+    
+    assert cache.get("platforms") == {"platforms": [{"platform_code": "steam"}], "total": 1}
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = TTLCache(ttl=-1)
+    cache.set("platforms", {"total": 1})
+    
+    assert cache.get("platforms") is None
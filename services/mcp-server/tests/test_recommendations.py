@@ -8,28 +8,27 @@ from tools.recommendations import recommend_games
 
 
 @pytest.mark.asyncio
-async def test_recommend_games_no_library(test_session, override_get_session):
+async def test_recommend_games_no_library(test_session, bulk_insert, override_get_session):
     """Test recommendations without user library data."""
     # Add some test games
-    game1 = Game(
-        game_id=uuid4(),
-        title="High Rated Action Game",
-        genres=["Action", "Adventure"],
-        metacritic_score=90,
-        steam_score=95,
-        steam_id="123456"
-    )
-    
-    game2 = Game(
-        game_id=uuid4(),
-        title="Average RPG Game",
-        genres=["RPG", "Fantasy"],
-        metacritic_score=75,
-        steam_score=80,
-        steam_id="789012"
-    )
-    
-    test_session.add_all([game1, game2])
+    await bulk_insert(Game, [
+        {
+            "game_id": uuid4(),
+            "title": "High Rated Action Game",
+            "genres": ["Action", "Adventure"],
+            "metacritic_score": 90,
+            "steam_score": 95,
+            "steam_appid": 123456
+        },
+        {
+            "game_id": uuid4(),
+            "title": "Average RPG Game",
+            "genres": ["RPG", "Fantasy"],
+            "metacritic_score": 75,
+            "steam_score": 80,
+            "steam_appid": 789012
+        },
+    ])
     await test_session.commit()
     
     result = await recommend_games(limit=5)
@@ -41,26 +40,25 @@ async def test_recommend_games_no_library(test_session, override_get_session):
 
 
 @pytest.mark.asyncio
-async def test_recommend_games_with_criteria(test_session, override_get_session):
+async def test_recommend_games_with_criteria(test_session, bulk_insert, override_get_session):
     """Test recommendations with specific criteria."""
     # Add test games
-    action_game = Game(
-        game_id=uuid4(),
-        title="Action Game",
-        genres=["Action", "Shooter"],
-        metacritic_score=85,
-        steam_id="123456"
-    )
-    
-    rpg_game = Game(
-        game_id=uuid4(),
-        title="RPG Game",
-        genres=["RPG", "Adventure"],
-        metacritic_score=90,
-        steam_id="789012"
-    )
-    
-    test_session.add_all([action_game, rpg_game])
+    await bulk_insert(Game, [
+        {
+            "game_id": uuid4(),
+            "title": "Action Game",
+            "genres": ["Action", "Shooter"],
+            "metacritic_score": 85,
+            "steam_appid": 123456
+        },
+        {
+            "game_id": uuid4(),
+            "title": "RPG Game",
+            "genres": ["RPG", "Adventure"],
+            "metacritic_score": 90,
+            "steam_appid": 789012
+        },
+    ])
     await test_session.commit()
     
     # Test with genre criteria
@@ -78,24 +76,23 @@ async def test_recommend_games_with_criteria(test_session, override_get_session)
 
 
 @pytest.mark.asyncio
-async def test_recommend_games_rating_filter(test_session, override_get_session):
+async def test_recommend_games_rating_filter(test_session, bulk_insert, override_get_session):
     """Test recommendations with rating filter."""
     # Add games with different ratings
-    high_rated = Game(
-        game_id=uuid4(),
-        title="High Rated Game",
-        metacritic_score=95,
-        steam_id="123456"
-    )
-    
-    low_rated = Game(
-        game_id=uuid4(),
-        title="Low Rated Game",
-        metacritic_score=60,
-        steam_id="789012"
-    )
-    
-    test_session.add_all([high_rated, low_rated])
+    await bulk_insert(Game, [
+        {
+            "game_id": uuid4(),
+            "title": "High Rated Game",
+            "metacritic_score": 95,
+            "steam_appid": 123456
+        },
+        {
+            "game_id": uuid4(),
+            "title": "Low Rated Game",
+            "metacritic_score": 60,
+            "steam_appid": 789012
+        },
+    ])
     await test_session.commit()
     
     result = await recommend_games(
@@ -111,7 +108,7 @@ async def test_recommend_games_rating_filter(test_session, override_get_session)
 
 
 @pytest.mark.asyncio
-async def test_recommend_games_with_user_preferences(test_session, override_get_session):
+async def test_recommend_games_with_user_preferences(test_session, bulk_insert, override_get_session):
     """Test recommendations based on user library preferences."""
     # Create test platform and library
     platform = Platform(
@@ -129,63 +126,64 @@ async def test_recommend_games_with_user_preferences(test_session, override_get_
         display_name="My Steam Library"
     )
     
-    # Add games user owns (showing preference for RPG)
-    owned_rpg1 = Game(
-        game_id=uuid4(),
-        title="Owned RPG 1",
-        genres=["RPG", "Fantasy"],
-        developer="RPG Studio",
-        steam_id="111111"
-    )
-    
-    owned_rpg2 = Game(
-        game_id=uuid4(),
-        title="Owned RPG 2",
-        genres=["RPG", "Adventure"],
-        developer="RPG Studio",
-        steam_id="222222"
-    )
-    
-    # Add potential recommendations
-    new_rpg = Game(
-        game_id=uuid4(),
-        title="New RPG Game",
-        genres=["RPG", "Strategy"],
-        developer="RPG Studio",
-        metacritic_score=85,
-        steam_id="333333"
-    )
-    
-    new_action = Game(
-        game_id=uuid4(),
-        title="New Action Game",
-        genres=["Action", "Shooter"],
-        metacritic_score=80,
-        steam_id="444444"
-    )
+    test_session.add_all([platform, library])
+    await test_session.flush()
+    
+    owned_rpg1_id = uuid4()
+    owned_rpg2_id = uuid4()
+    
+    await bulk_insert(Game, [
+        # Games user owns (showing preference for RPG)
+        {
+            "game_id": owned_rpg1_id,
+            "title": "Owned RPG 1",
+            "genres": ["RPG", "Fantasy"],
+            "developer": "RPG Studio",
+            "steam_appid": 111111
+        },
+        {
+            "game_id": owned_rpg2_id,
+            "title": "Owned RPG 2",
+            "genres": ["RPG", "Adventure"],
+            "developer": "RPG Studio",
+            "steam_appid": 222222
+        },
+        # Potential recommendations
+        {
+            "game_id": uuid4(),
+            "title": "New RPG Game",
+            "genres": ["RPG", "Strategy"],
+            "developer": "RPG Studio",
+            "metacritic_score": 85,
+            "steam_appid": 333333
+        },
+        {
+            "game_id": uuid4(),
+            "title": "New Action Game",
+            "genres": ["Action", "Shooter"],
+            "metacritic_score": 80,
+            "steam_appid": 444444
+        },
+    ])
     
     # User games (showing high playtime in RPGs)
-    user_game1 = UserGame(
-        user_game_id=uuid4(),
-        library_id=library.library_id,
-        game_id=owned_rpg1.game_id,
-        owned=True,
-        total_playtime_minutes=1200,  # 20 hours
-        user_rating=5
-    )
-    
-    user_game2 = UserGame(
-        user_game_id=uuid4(),
-        library_id=library.library_id,
-        game_id=owned_rpg2.game_id,
-        owned=True,
-        total_playtime_minutes=900,   # 15 hours
-        user_rating=4
-    )
-    
-    test_session.add_all([
-        platform, library, owned_rpg1, owned_rpg2, 
-        new_rpg, new_action, user_game1, user_game2
+    await bulk_insert(UserGame, [
+        {
+            "user_game_id": uuid4(),
+            "library_id": library.library_id,
+            "game_id": owned_rpg1_id,
+            "owned": True,
+            "total_playtime_minutes": 1200,  # 20 hours
+            "user_rating": 5
+        },
+        {
+            "user_game_id": uuid4(),
+            "library_id": library.library_id,
+            "game_id": owned_rpg2_id,
+            "owned": True,
+            "total_playtime_minutes": 900,   # 15 hours
+            "user_rating": 4
+        },
     ])
     await test_session.commit()
     
@@ -210,7 +208,7 @@ async def test_recommend_games_with_user_preferences(test_session, override_get_
 
 
 @pytest.mark.asyncio
-async def test_recommend_games_exclude_owned(test_session, override_get_session):
+async def test_recommend_games_exclude_owned(test_session, bulk_insert, override_get_session):
     """Test that owned games are excluded by default."""
     # Create test platform and library
     platform = Platform(
@@ -228,27 +226,32 @@ async def test_recommend_games_exclude_owned(test_session, override_get_session)
         display_name="My Steam Library"
     )
     
-    # Add owned and unowned games
-    owned_game = Game(
-        game_id=uuid4(),
-        title="Owned Game",
-        steam_id="111111"
-    )
-    
-    unowned_game = Game(
-        game_id=uuid4(),
-        title="Unowned Game",
-        steam_id="222222"
-    )
+    test_session.add_all([platform, library])
+    await test_session.flush()
     
-    user_game = UserGame(
-        user_game_id=uuid4(),
-        library_id=library.library_id,
-        game_id=owned_game.game_id,
-        owned=True
-    )
+    # Add owned and unowned games
+    owned_game_id = uuid4()
+    await bulk_insert(Game, [
+        {
+            "game_id": owned_game_id,
+            "title": "Owned Game",
+            "steam_appid": 111111
+        },
+        {
+            "game_id": uuid4(),
+            "title": "Unowned Game",
+            "steam_appid": 222222
+        },
+    ])
     
-    test_session.add_all([platform, library, owned_game, unowned_game, user_game])
+    await bulk_insert(UserGame, [
+        {
+            "user_game_id": uuid4(),
+            "library_id": library.library_id,
+            "game_id": owned_game_id,
+            "owned": True
+        },
+    ])
     await test_session.commit()
     
     # Test exclude owned (default)
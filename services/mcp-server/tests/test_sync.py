@@ -0,0 +1,46 @@
+"""Tests for platform synchronization MCP tools."""
+
+import pytest
+from uuid import UUID, uuid4
+from sqlalchemy import insert, select
+from models import Platform, UserLibrary, SyncOperation
+from tools.sync import sync_platform_library
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_sync_platform_library_starts_operation(pg_session):
+    """Test that starting a sync records the operation and marks the library in progress."""
+    platform_id = uuid4()
+    library_id = uuid4()
+    await pg_session.execute(insert(Platform), [{
+        "platform_id": platform_id,
+        "platform_code": f"test_{platform_id.hex[:8]}",
+        "platform_name": "Test Platform",
+        "api_available": True
+    }])
+    await pg_session.execute(insert(UserLibrary), [{
+        "library_id": library_id,
+        "platform_id": platform_id,
+        "user_identifier": "test-user",
+        "display_name": "Test Library"
+    }])
+    await pg_session.commit()
+    
+    result = await sync_platform_library(library_id=str(library_id))
+    
+    assert "error" not in result
+    assert result["status"] == "started"
+    
+    operation = (await pg_session.execute(
+        select(SyncOperation.library_id, SyncOperation.status).where(
+            SyncOperation.operation_id == UUID(result["operation_id"])
+        )
+    )).one()
+    assert operation.library_id == library_id
+    assert operation.status == "started"
+    
+    sync_status = await pg_session.scalar(
+        select(UserLibrary.sync_status).where(UserLibrary.library_id == library_id)
+    )
+    assert sync_status == "in_progress"
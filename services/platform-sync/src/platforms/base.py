@@ -1,14 +1,40 @@
 """Base platform integration class."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, AsyncGenerator
-from dataclasses import dataclass
-from datetime import datetime
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, AsyncGenerator, Tuple, Union
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter_ns
 import asyncio
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Title normalization patterns, compiled once rather than per synced game
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_EDITION_SUFFIX_RE = re.compile(
+    r'\s+(?:'
+    r'game of the year edition|deluxe edition|complete edition|definitive edition|'
+    r'gold edition|premium edition|ultimate edition|directors cut|remastered|hd'
+    r')$'
+)
+
+# Game details shared by every sync, keyed by (platform_code, platform_game_id);
+# values are futures so concurrent lookups of one game share a single fetch
+GAME_DETAILS_CACHE_SIZE = 50_000
+_game_details_cache: "OrderedDict[Tuple[str, str], asyncio.Future]" = OrderedDict()
+
+# How long a sync consumer waits for more games before processing a partial batch
+BATCH_DRAIN_TIMEOUT_SECONDS = 0.5
+
+
+def utc_from_epoch(timestamp: Optional[int]) -> Optional[datetime]:
+    """Convert a Unix timestamp from a platform API to an aware UTC datetime (None if unset)."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp else None
+
 
 class PlatformError(Exception):
     """Base exception for platform integration errors."""
@@ -22,7 +48,7 @@ class RateLimitError(PlatformError):
         self.retry_after = retry_after
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GameData:
     """Standard game data structure across platforms."""
     title: str
@@ -48,7 +74,7 @@ class GameData:
     platform_data: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserGameData:
     """User-specific game data structure."""
     game_data: GameData
@@ -60,7 +86,7 @@ class UserGameData:
     platform_data: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AchievementData:
     """Achievement data structure."""
     platform_achievement_id: str
@@ -72,7 +98,7 @@ class AchievementData:
     is_hidden: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserAchievementData:
     """User achievement unlock data."""
     achievement_data: AchievementData
@@ -80,7 +106,7 @@ class UserAchievementData:
     progress_percentage: int = 100
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserProfileData:
     """User profile data structure."""
     user_identifier: str
@@ -94,6 +120,18 @@ class UserProfileData:
     platform_data: Optional[Dict[str, Any]] = None
 
 
+@dataclass(slots=True)
+class SyncStats:
+    """Counters for a library sync (or for one batch of it)."""
+    games_processed: int = 0
+    games_added: int = 0
+    games_updated: int = 0
+    achievements_synced: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
 class BasePlatform(ABC):
     """Abstract base class for platform integrations."""
     
@@ -166,6 +204,60 @@ class BasePlatform(ABC):
         """Get user's achievements for a specific game."""
         pass
     
+    async def cached_get_game_details(self, platform_game_id: str) -> GameData:
+        """
+        Get detailed game information, fetching each game at most once.
+        
+        Results are shared across all syncs (and platform instances) of this
+        platform, and concurrent requests for the same game wait on a single
+        in-flight fetch. Failed fetches are not cached.
+        """
+        key = (self.platform_code, platform_game_id)
+        future = _game_details_cache.get(key)
+        if future is not None:
+            _game_details_cache.move_to_end(key)
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        _game_details_cache[key] = future
+        if len(_game_details_cache) > GAME_DETAILS_CACHE_SIZE:
+            _game_details_cache.popitem(last=False)
+        
+        try:
+            game_data = await self.get_game_details(platform_game_id)
+        except BaseException as e:
+            if _game_details_cache.get(key) is future:
+                del _game_details_cache[key]
+            if isinstance(e, asyncio.CancelledError):
+                # Waiters were not cancelled themselves; give them an ordinary error
+                e = PlatformError(f"Fetching game details for {platform_game_id} was cancelled")
+            future.set_exception(e)
+            future.exception()  # Retrieved here; waiters (if any) re-raise it
+            raise
+        
+        future.set_result(game_data)
+        return game_data
+    
+    async def get_game_details_many(
+        self,
+        platform_game_ids: List[str]
+    ) -> List[Union[GameData, BaseException]]:
+        """
+        Get detailed game information for several games.
+        
+        Fetches the games concurrently through cached_get_game_details; platforms
+        whose API returns several games per request should override this to
+        fetch them in one call.
+        
+        Returns:
+            GameData, or the exception raised fetching it (possibly a
+            BaseException such as CancelledError), for each ID in order
+        """
+        return await asyncio.gather(
+            *(self.cached_get_game_details(platform_game_id) for platform_game_id in platform_game_ids),
+            return_exceptions=True
+        )
+    
     async def test_connection(self) -> Dict[str, Any]:
         """Test platform connection and return status."""
         test_result = {
@@ -175,7 +267,7 @@ class BasePlatform(ABC):
             "response_time_ms": None,
         }
         
-        start_time = asyncio.get_event_loop().time()
+        start_ns = perf_counter_ns()
         
         try:
             is_valid = await self.validate_credentials()
@@ -192,8 +284,7 @@ class BasePlatform(ABC):
             test_result["error"] = f"Unexpected error: {e}"
             self.logger.exception("Unexpected error during connection test")
         
-        end_time = asyncio.get_event_loop().time()
-        test_result["response_time_ms"] = round((end_time - start_time) * 1000, 2)
+        test_result["response_time_ms"] = round((perf_counter_ns() - start_ns) / 1_000_000, 2)
         
         return test_result
     
@@ -201,93 +292,128 @@ class BasePlatform(ABC):
         self,
         user_identifier: str,
         progress_callback: Optional[callable] = None,
-        batch_size: int = 50
+        batch_size: int = 50,
+        concurrency: int = 4
     ) -> Dict[str, Any]:
         """
         Sync user's complete game library.
         
+        Games are fetched by a producer task into a bounded queue and written by
+        `concurrency` consumer tasks, so platform requests and batch processing
+        overlap instead of running one after the other.
+        
         Args:
             user_identifier: Platform-specific user ID
             progress_callback: Optional callback for sync progress updates
             batch_size: Number of games to process in each batch
+            concurrency: Number of batches processed concurrently
             
         Returns:
             Sync summary with statistics
         """
-        sync_stats = {
-            "games_processed": 0,
-            "games_added": 0,
-            "games_updated": 0,
-            "achievements_synced": 0,
-            "errors": [],
-            "started_at": datetime.utcnow(),
-            "completed_at": None,
-        }
+        sync_stats = SyncStats(started_at=datetime.now(timezone.utc))
         
         try:
             # Get user profile first
             profile = await self.get_user_profile(user_identifier)
             self.logger.info(f"Starting sync for user: {profile.display_name}")
             
-            # Process games in batches
-            batch = []
-            async for user_game in self.get_user_games(user_identifier):
-                batch.append(user_game)
-                sync_stats["games_processed"] += 1
+            queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 4)
+            stats_lock = asyncio.Lock()
+            
+            async def produce():
+                async for user_game in self.get_user_games(user_identifier):
+                    await queue.put(user_game)
                 
-                if len(batch) >= batch_size:
-                    await self._process_game_batch(batch, sync_stats)
-                    
-                    if progress_callback:
-                        await progress_callback(sync_stats)
-                    
+                # One end-of-stream marker per consumer
+                for _ in range(concurrency):
+                    await queue.put(None)
+            
+            async def consume():
+                finished = False
+                while not finished:
                     batch = []
+                    user_game = await queue.get()
+                    while user_game is not None:
+                        batch.append(user_game)
+                        if len(batch) >= batch_size:
+                            break
+                        try:
+                            user_game = await asyncio.wait_for(queue.get(), BATCH_DRAIN_TIMEOUT_SECONDS)
+                        except asyncio.TimeoutError:
+                            break
+                    finished = user_game is None
+                    
+                    if batch:
+                        # Each batch records into its own stats, merged under the lock so
+                        # concurrent batches never interleave updates or progress reports
+                        batch_stats = SyncStats()
+                        await self._process_game_batch(batch, batch_stats)
+                        
+                        async with stats_lock:
+                            sync_stats.games_processed += len(batch)
+                            sync_stats.games_added += batch_stats.games_added
+                            sync_stats.games_updated += batch_stats.games_updated
+                            sync_stats.achievements_synced += batch_stats.achievements_synced
+                            sync_stats.errors.extend(batch_stats.errors)
+                            
+                            if progress_callback:
+                                await progress_callback(asdict(sync_stats))
             
-            # Process remaining games
-            if batch:
-                await self._process_game_batch(batch, sync_stats)
+            tasks = [asyncio.create_task(produce())]
+            tasks.extend(asyncio.create_task(consume()) for _ in range(concurrency))
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # A failed producer or consumer would leave the others blocked on the queue
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
             
-            sync_stats["completed_at"] = datetime.utcnow()
+            sync_stats.completed_at = datetime.now(timezone.utc)
             self.logger.info(f"Sync completed: {sync_stats}")
             
         except Exception as e:
-            sync_stats["errors"].append(f"Sync failed: {e}")
+            sync_stats.errors.append(f"Sync failed: {e}")
             self.logger.exception("Error during library sync")
             raise
         
-        return sync_stats
+        return asdict(sync_stats)
     
-    async def _process_game_batch(self, batch: List[UserGameData], sync_stats: Dict[str, Any]):
-        """Process a batch of games (to be overridden for database operations)."""
+    async def _process_game_batch(self, batch: List[UserGameData], sync_stats: SyncStats):
+        """
+        Process a batch of games.
+        
+        Batches may run concurrently; `sync_stats` holds this batch's counters
+        (games_added, games_updated, achievements_synced, errors) and is merged
+        into the sync summary afterwards.
+        """
+        added, updated = await self._bulk_upsert_games(batch)
+        sync_stats.games_added += added
+        sync_stats.games_updated += updated
+    
+    async def _bulk_upsert_games(self, batch: List[UserGameData]) -> Tuple[int, int]:
+        """
+        Write a batch of games and the user's copies of them (to be overridden
+        for database operations).
+        
+        Implementations must write the whole batch in a fixed number of
+        statements, never one query per game: resolve existing games with one
+        SELECT by platform ID, then one multi-row INSERT ... ON CONFLICT DO UPDATE
+        each for games and user_games.
+        
+        Returns:
+            Number of games added and number of games updated
+        """
         # This would be implemented by the service layer that uses the platform
-        # For now, just update stats
-        sync_stats["games_added"] += len(batch)
+        # For now, count every game as added
+        return len(batch), 0
     
     def _normalize_game_title(self, title: str) -> str:
         """Normalize game title for cross-platform matching."""
-        import re
-        
         # Remove special characters and normalize spacing
-        normalized = re.sub(r'[^\w\s]', '', title.lower())
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _WHITESPACE_RE.sub(' ', _PUNCTUATION_RE.sub('', title.lower())).strip()
         
         # Remove common suffixes
-        suffixes = [
-            'game of the year edition',
-            'deluxe edition', 
-            'complete edition',
-            'definitive edition',
-            'gold edition',
-            'premium edition',
-            'ultimate edition',
-            'directors cut',
-            'remastered',
-            'hd',
-        ]
-        
-        for suffix in suffixes:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)].strip()
-                break
-        
-        return normalized
\ No newline at end of file
+        return _EDITION_SUFFIX_RE.sub('', normalized).strip()
@@ -9,7 +9,8 @@ from urllib.parse import urlencode
 
 from .base import (
     BasePlatform, PlatformError, RateLimitError,
-    GameData, UserGameData, AchievementData, UserAchievementData, UserProfileData
+    GameData, UserGameData, AchievementData, UserAchievementData, UserProfileData,
+    utc_from_epoch
 )
 
 
@@ -24,6 +25,14 @@ class SteamPlatform(BasePlatform):
     REQUESTS_PER_SECOND = 2
     REQUESTS_PER_MINUTE = 100
     
+    # Store appdetails only returns full details for one app per request, so
+    # detail lookups are issued concurrently in chunks; request starts are still
+    # spaced by the store limiter below, only the response latency overlaps
+    DETAILS_BATCH_SIZE = 10
+    
+    # The store API is limited separately (about 200 requests per 5 minutes)
+    STORE_REQUEST_INTERVAL_SECONDS = 1.5
+    
     def __init__(self, credentials: Dict[str, Any]):
         super().__init__("steam", credentials)
         self.api_key = credentials.get("steam_api_key")
@@ -39,6 +48,8 @@ class SteamPlatform(BasePlatform):
         # Simple rate limiter (in production, use Redis-based limiter)
         self._last_request_time = 0
         self._request_semaphore = asyncio.Semaphore(self.REQUESTS_PER_SECOND)
+        self._store_request_lock = asyncio.Lock()
+        self._next_store_request_at = 0.0
     
     @property
     def platform_name(self) -> str:
@@ -83,6 +94,15 @@ class SteamPlatform(BasePlatform):
             except httpx.RequestError as e:
                 raise PlatformError(f"Steam API request failed: {e}")
     
+    async def _throttle_store_request(self):
+        """Wait until the next store API request may start."""
+        async with self._store_request_lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_store_request_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_store_request_at = loop.time() + self.STORE_REQUEST_INTERVAL_SECONDS
+    
     async def validate_credentials(self) -> bool:
         """Validate Steam API key."""
         try:
@@ -130,7 +150,7 @@ class SteamPlatform(BasePlatform):
             avatar_url=player.get("avatarfull"),
             profile_url=player.get("profileurl"),
             profile_visibility=self._parse_profile_visibility(player.get("communityvisibilitystate", 1)),
-            member_since=datetime.fromtimestamp(player.get("timecreated", 0), tz=timezone.utc) if player.get("timecreated") else None,
+            member_since=utc_from_epoch(player.get("timecreated")),
             total_games=total_games,
             total_playtime_minutes=total_playtime_minutes,
             platform_data={
@@ -170,34 +190,43 @@ class SteamPlatform(BasePlatform):
         if limit:
             games = games[:limit]
         
-        for game in games:
-            try:
-                # Get additional game details
-                game_details = await self.get_game_details(str(game["appid"]))
-                
-                # Convert playtime to minutes
-                total_playtime_minutes = game.get("playtime_forever", 0)
-                last_played_timestamp = game.get("rtime_last_played")
-                
-                user_game_data = UserGameData(
-                    game_data=game_details,
-                    owned=True,
-                    total_playtime_minutes=total_playtime_minutes,
-                    last_played_at=datetime.fromtimestamp(last_played_timestamp, tz=timezone.utc) if last_played_timestamp else None,
-                    platform_data={
-                        "playtime_2weeks": game.get("playtime_2weeks", 0),
-                        "playtime_windows_forever": game.get("playtime_windows_forever", 0),
-                        "playtime_mac_forever": game.get("playtime_mac_forever", 0),
-                        "playtime_linux_forever": game.get("playtime_linux_forever", 0),
-                        "has_community_visible_stats": game.get("has_community_visible_stats", False)
-                    }
-                )
-                
-                yield user_game_data
-                
-            except Exception as e:
-                self.logger.warning(f"Error processing Steam game {game.get('appid')}: {e}")
-                continue
+        for start in range(0, len(games), self.DETAILS_BATCH_SIZE):
+            chunk = games[start:start + self.DETAILS_BATCH_SIZE]
+            
+            # Get additional game details for the chunk concurrently
+            chunk_details = await self.get_game_details_many([str(game["appid"]) for game in chunk])
+            
+            for game, game_details in zip(chunk, chunk_details):
+                try:
+                    if isinstance(game_details, BaseException):
+                        raise game_details
+                    
+                    # Convert playtime to minutes
+                    total_playtime_minutes = game.get("playtime_forever", 0)
+                    last_played_timestamp = game.get("rtime_last_played")
+                    
+                    user_game_data = UserGameData(
+                        game_data=game_details,
+                        owned=True,
+                        total_playtime_minutes=total_playtime_minutes,
+                        last_played_at=utc_from_epoch(last_played_timestamp),
+                        platform_data={
+                            "playtime_2weeks": game.get("playtime_2weeks", 0),
+                            "playtime_windows_forever": game.get("playtime_windows_forever", 0),
+                            "playtime_mac_forever": game.get("playtime_mac_forever", 0),
+                            "playtime_linux_forever": game.get("playtime_linux_forever", 0),
+                            "has_community_visible_stats": game.get("has_community_visible_stats", False)
+                        }
+                    )
+                    
+                    yield user_game_data
+                    
+                except RateLimitError:
+                    # Fail the sync so it is retried later instead of dropping the rest
+                    raise
+                except Exception as e:
+                    self.logger.warning(f"Error processing Steam game {game.get('appid')}: {e}")
+                    continue
     
     async def get_game_details(self, platform_game_id: str) -> GameData:
         """Get detailed Steam game information."""
@@ -208,8 +237,11 @@ class SteamPlatform(BasePlatform):
         params = {"appids": appid, "cc": "us", "l": "en"}
         
         try:
+            await self._throttle_store_request()
             response = await self.client.get(store_url, params=params)
-            if response.status_code != 200:
+            if response.status_code == 429:
+                raise RateLimitError("Steam store API rate limit exceeded", retry_after=60)
+            elif response.status_code != 200:
                 raise PlatformError(f"Steam store API error: {response.status_code}")
             
             data = response.json()
@@ -337,7 +369,7 @@ class SteamPlatform(BasePlatform):
                     
                     user_achievements.append(UserAchievementData(
                         achievement_data=achievement_data,
-                        unlocked_at=datetime.fromtimestamp(unlock_time, tz=timezone.utc) if unlock_time else datetime.utcnow(),
+                        unlocked_at=utc_from_epoch(unlock_time) or datetime.now(timezone.utc),
                         progress_percentage=100
                     ))
             
@@ -85,7 +85,7 @@ async def check_database_version() -> Dict[str, Any]:
 async def check_database_extensions() -> Dict[str, Any]:
     """Check required PostgreSQL extensions."""
     extensions_info = {
-        "required_extensions": ["uuid-ossp"],
+        "required_extensions": ["pg_trgm"],
         "installed_extensions": [],
         "missing_extensions": [],
         "error": None,
@@ -1,6 +1,8 @@
 """Base model class for all database models."""
 
-from uuid import uuid4
+import os
+import time
+from uuid import UUID as PyUUID
 from datetime import datetime
 from sqlalchemy import DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
@@ -8,6 +10,19 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def uuid7() -> PyUUID:
+    """Generate a time-ordered UUIDv7 (RFC 9562) for primary keys.
+    
+    The leading 48 bits are the Unix timestamp in milliseconds, so new rows
+    append to the right edge of the primary key index instead of random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return PyUUID(int=value)
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
@@ -35,6 +50,6 @@ class UUIDMixin:
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        server_default=func.uuid_generate_v4()
+        default=uuid7,
+        server_default=func.uuid_generate_v7()
     )
\ No newline at end of file
@@ -1,11 +1,10 @@
 """Game model for universal game catalog."""
 
 from datetime import date
-from sqlalchemy import String, Text, Date, Integer, CheckConstraint
+from sqlalchemy import String, Text, Date, Integer, SmallInteger, Computed, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class Game(Base, TimestampMixin):
@@ -16,10 +15,9 @@ class Game(Base, TimestampMixin):
     game_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     title: Mapped[str] = mapped_column(String(500), nullable=False)
-    normalized_title: Mapped[str] = mapped_column(String(500), nullable=False)
     slug: Mapped[str] = mapped_column(String(500), unique=True, nullable=True)
     
     # Rich metadata
@@ -35,9 +33,20 @@ class Game(Base, TimestampMixin):
     # Content ratings
     esrb_rating: Mapped[str] = mapped_column(String(20), nullable=True)
     esrb_descriptors: Mapped[list] = mapped_column(JSONB, nullable=True)
+    # Position in the ESRB order (E=1 ... AO=5, RP=0) so rating filters are a range scan
+    esrb_rank: Mapped[int] = mapped_column(
+        SmallInteger,
+        Computed(
+            "CASE esrb_rating WHEN 'E' THEN 1 WHEN 'E10+' THEN 2 WHEN 'T' THEN 3 "
+            "WHEN 'M' THEN 4 WHEN 'AO' THEN 5 WHEN 'RP' THEN 0 END",
+            persisted=True
+        ),
+        nullable=True
+    )
     pegi_rating: Mapped[int] = mapped_column(Integer, nullable=True)
     
-    # Review scores
+    # Review scores (the score_0_100 domain lives in the DDL, migration 001 and
+    # schema.sql; the ORM maps the columns as plain Integer)
     metacritic_score: Mapped[int] = mapped_column(Integer, nullable=True)
     metacritic_url: Mapped[str] = mapped_column(String(500), nullable=True)
     steam_score: Mapped[int] = mapped_column(Integer, nullable=True)
@@ -61,8 +70,18 @@ class Game(Base, TimestampMixin):
     playtime_main_hours: Mapped[int] = mapped_column(Integer, nullable=True)
     playtime_completionist_hours: Mapped[int] = mapped_column(Integer, nullable=True)
     
-    # Search optimization
-    search_vector: Mapped[str] = mapped_column(TSVECTOR, nullable=True)
+    # Search optimization (generated by PostgreSQL, never written by the app)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(developer, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(publisher, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True
+        ),
+        nullable=True
+    )
     
     # Relationships
     user_games = relationship("UserGame", back_populates="game", cascade="all, delete-orphan")
@@ -71,10 +90,15 @@ class Game(Base, TimestampMixin):
     primary_matches = relationship("GameMatch", foreign_keys="GameMatch.primary_game_id", back_populates="primary_game")
     matched_games = relationship("GameMatch", foreign_keys="GameMatch.matched_game_id", back_populates="matched_game")
     
-    # Constraints
+    # Indexes
     __table_args__ = (
-        CheckConstraint("metacritic_score BETWEEN 0 AND 100", name="ck_metacritic_score"),
-        CheckConstraint("steam_score BETWEEN 0 AND 100", name="ck_steam_score"),
+        Index("idx_games_esrb_rank", "esrb_rank"),
+        Index("idx_games_title_game_id", "title", "game_id"),
+        Index("ux_games_steam_appid", "steam_appid", unique=True, postgresql_where=text("steam_appid IS NOT NULL")),
+        Index("ux_games_gog_id", "gog_id", unique=True, postgresql_where=text("gog_id IS NOT NULL")),
+        Index("ux_games_epic_id", "epic_id", unique=True, postgresql_where=text("epic_id IS NOT NULL")),
+        Index("ux_games_xbox_id", "xbox_id", unique=True, postgresql_where=text("xbox_id IS NOT NULL")),
+        Index("ux_games_psn_id", "psn_id", unique=True, postgresql_where=text("psn_id IS NOT NULL")),
     )
     
     def __repr__(self) -> str:
@@ -3,8 +3,7 @@
 from sqlalchemy import String, Text, Integer, Boolean, DECIMAL, UniqueConstraint, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class GameAchievement(Base, TimestampMixin):
@@ -15,7 +14,7 @@ class GameAchievement(Base, TimestampMixin):
     achievement_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     game_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
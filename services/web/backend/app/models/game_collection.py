@@ -3,8 +3,7 @@
 from sqlalchemy import String, Text, Boolean, UniqueConstraint, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class GameCollection(Base, TimestampMixin):
@@ -15,7 +14,7 @@ class GameCollection(Base, TimestampMixin):
     collection_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     library_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
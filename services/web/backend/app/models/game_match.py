@@ -3,8 +3,7 @@
 from sqlalchemy import String, DECIMAL, Boolean, CheckConstraint, UniqueConstraint, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class GameMatch(Base, TimestampMixin):
@@ -15,7 +14,7 @@ class GameMatch(Base, TimestampMixin):
     match_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     primary_game_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -3,8 +3,7 @@
 from sqlalchemy import String, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class Platform(Base, TimestampMixin):
@@ -15,7 +14,7 @@ class Platform(Base, TimestampMixin):
     platform_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     platform_code: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     platform_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -5,8 +5,7 @@ from datetime import datetime
 from sqlalchemy import String, DateTime, Integer, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class OperationType(str, Enum):
@@ -33,7 +32,7 @@ class SyncOperation(Base, TimestampMixin):
     operation_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     library_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -4,8 +4,7 @@ from datetime import datetime
 from sqlalchemy import DateTime, Integer, CheckConstraint, UniqueConstraint, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base
-from uuid import uuid4
+from .base import Base, uuid7
 
 
 class UserAchievement(Base):
@@ -16,7 +15,7 @@ class UserAchievement(Base):
     user_achievement_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     user_game_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -2,11 +2,10 @@
 
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import String, Boolean, Text, Integer, DateTime, ForeignKey, CheckConstraint, UniqueConstraint
+from sqlalchemy import String, Boolean, Text, Integer, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class GameStatus(str, Enum):
@@ -26,7 +25,7 @@ class UserGame(Base, TimestampMixin):
     user_game_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     library_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -76,6 +75,8 @@ class UserGame(Base, TimestampMixin):
     __table_args__ = (
         UniqueConstraint("library_id", "game_id", name="uq_library_game"),
         CheckConstraint("user_rating BETWEEN 1 AND 5", name="ck_user_rating"),
+        Index("idx_user_games_library_last_played", "library_id", text("last_played_at DESC")),
+        Index("idx_user_games_first_played", "first_played_at", postgresql_where=text("first_played_at IS NOT NULL")),
     )
     
     def __repr__(self) -> str:
@@ -2,11 +2,10 @@
 
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import String, Boolean, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Boolean, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .base import Base, TimestampMixin
-from uuid import uuid4
+from .base import Base, TimestampMixin, uuid7
 
 
 class SyncStatus(str, Enum):
@@ -26,7 +25,7 @@ class UserLibrary(Base, TimestampMixin):
     library_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4
+        default=uuid7
     )
     platform_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -50,7 +49,13 @@ class UserLibrary(Base, TimestampMixin):
     
     # Constraints
     __table_args__ = (
-        UniqueConstraint("platform_id", "user_identifier", name="uq_platform_user"),
+        Index(
+            "ux_user_libraries_platform_user",
+            "platform_id",
+            "user_identifier",
+            unique=True,
+            postgresql_include=["library_id", "display_name", "sync_enabled", "last_sync_at"],
+        ),
     )
     
     def __repr__(self) -> str: